@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Shared reader for aop-nightmare.cfg
+Parses the INI-like configuration used by the Python tooling into nested dicts.
+"""
+
+from pathlib import Path
+from typing import Dict, List
+
+DEFAULT_CONFIG = "scripts/aop-nightmare.cfg"
+
+
+def load_config(config_path: str = DEFAULT_CONFIG) -> Dict[str, Dict[str, str]]:
+    """Load configuration from CFG file"""
+    config = {}
+    current_section = None
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            if line.startswith('[') and line.endswith(']'):
+                current_section = line[1:-1].lower()
+                config[current_section] = {}
+            elif '=' in line and current_section:
+                key, value = line.split('=', 1)
+                config[current_section][key.strip()] = value.strip()
+
+    return config
+
+
+def split_list(value: str) -> List[str]:
+    """Split a space-separated cfg value into its entries"""
+    return value.split() if value else []
+
+
+def server_path(config: Dict[str, Dict[str, str]]) -> Path:
+    """Return the configured server root"""
+    return Path(config['paths']['server'])
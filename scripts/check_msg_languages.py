@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+FOnline Multi-Language MSG Checker
+Compares every text/<lang>/*.MSG against the reference language (engl) and
+reports keys that are missing or extra and texts whose %d/%s placeholders do
+not match, per file and per language.
+
+Each MSG file is loaded once, in parallel, into a sorted key array plus an
+aligned array of placeholder signature ids, so every comparison is a handful
+of vectorized set operations instead of per-key dict lookups.
+
+Usage:
+    python scripts/check_msg_languages.py [--text-dir <server>/text] [--reference engl]
+                                          [--jobs N] [--limit 10] [--report msg_report.json]
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from aop_config import DEFAULT_CONFIG, load_config, server_path
+from msg_reader import msg_files, read_msg
+
+DEFAULT_REFERENCE = "engl"
+
+# printf-style conversions the engine formats MSG texts with; %% is a literal
+PLACEHOLDER_RE = re.compile(r"%%|%[-+#0]*\d*(?:\.\d+)?([dsiucfxX])")
+# %i and %u format the same values as %d
+CONVERSION_CLASS = {"i": "d", "u": "d", "X": "x"}
+
+
+class MsgTable(NamedTuple):
+    keys: np.ndarray  # sorted unique int64 keys
+    formats: np.ndarray  # placeholder signature id per key, 0 = no placeholders
+
+
+class FormatPool:
+    """Interns placeholder signatures ("ds", "d", ...) as small integer ids"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {"": 0}
+        self.signatures: List[str] = [""]
+
+    def add(self, signature: str) -> int:
+        sid = self.ids.get(signature)
+        if sid is None:
+            sid = self.ids[signature] = len(self.signatures)
+            self.signatures.append(signature)
+        return sid
+
+
+def placeholder_signature(text: str) -> str:
+    """Ordered conversion letters of a MSG text, e.g. "ds" for "%d caps from %s" """
+    if "%" not in text:
+        return ""
+    return "".join(CONVERSION_CLASS.get(c, c) for c in PLACEHOLDER_RE.findall(text) if c)
+
+
+def _load_job(args) -> Tuple[str, str, np.ndarray, np.ndarray, List[str]]:
+    lang, name, path = args
+    strings = read_msg(path)
+    keys = np.fromiter(strings.keys(), dtype=np.int64, count=len(strings))
+    keys.sort()
+    format_keys = []
+    signatures = []
+    for key, text in strings.items():
+        signature = placeholder_signature(text)
+        if signature:
+            format_keys.append(key)
+            signatures.append(signature)
+    return lang, name, keys, np.array(format_keys, dtype=np.int64), signatures
+
+
+def discover_languages(text_dir: Path) -> Dict[str, Dict[str, Path]]:
+    """{lang: {FILE.MSG: path}} for every language directory with MSG files"""
+    languages = {}
+    for lang_dir in sorted(p for p in text_dir.iterdir() if p.is_dir()):
+        files = msg_files(lang_dir)
+        if files:
+            languages[lang_dir.name] = files
+    return languages
+
+
+def load_tables(languages: Dict[str, Dict[str, Path]], pool: FormatPool,
+                jobs: int = None) -> Dict[str, Dict[str, MsgTable]]:
+    """Parse every MSG file in parallel into MsgTables"""
+    todo = [(lang, name, str(path)) for lang, files in languages.items() for name, path in files.items()]
+    workers = min(jobs or os.cpu_count() or 1, len(todo)) or 1
+    tables: Dict[str, Dict[str, MsgTable]] = {lang: {} for lang in languages}
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+        if executor is None:
+            results = map(_load_job, todo)
+        else:
+            results = executor.map(_load_job, todo, chunksize=max(1, len(todo) // (workers * 4)))
+        for lang, name, keys, format_keys, signatures in results:
+            formats = np.zeros(len(keys), dtype=np.int32)
+            if signatures:
+                ids = np.fromiter((pool.add(s) for s in signatures), dtype=np.int32, count=len(signatures))
+                formats[np.searchsorted(keys, format_keys)] = ids
+            tables[lang][name] = MsgTable(keys, formats)
+    return tables
+
+
+def compare_tables(reference: MsgTable, other: MsgTable) -> Dict[str, np.ndarray]:
+    """Missing, extra and placeholder-mismatched keys of other against reference"""
+    missing = np.setdiff1d(reference.keys, other.keys, assume_unique=True)
+    extra = np.setdiff1d(other.keys, reference.keys, assume_unique=True)
+    common, ref_idx, other_idx = np.intersect1d(reference.keys, other.keys,
+                                                assume_unique=True, return_indices=True)
+    bad = reference.formats[ref_idx] != other.formats[other_idx]
+    return {
+        "missing": missing,
+        "extra": extra,
+        "placeholders": common[bad],
+        "expected": reference.formats[ref_idx[bad]],
+        "found": other.formats[other_idx[bad]],
+    }
+
+
+def check_languages(tables: Dict[str, Dict[str, MsgTable]], pool: FormatPool,
+                    reference: str = DEFAULT_REFERENCE) -> Dict:
+    """Per-language, per-file report against the reference language"""
+    ref_files = tables[reference]
+    report = {"reference": reference, "languages": {}}
+
+    for lang in sorted(tables):
+        if lang == reference:
+            continue
+        files = tables[lang]
+        lang_report = {
+            "missing_files": sorted(set(ref_files) - set(files)),
+            "extra_files": sorted(set(files) - set(ref_files)),
+            "files": {},
+            "totals": {"missing": 0, "extra": 0, "placeholders": 0},
+        }
+        for name in sorted(set(ref_files) & set(files)):
+            result = compare_tables(ref_files[name], files[name])
+            if not (result["missing"].size or result["extra"].size or result["placeholders"].size):
+                continue
+            lang_report["files"][name] = {
+                "missing": result["missing"].tolist(),
+                "extra": result["extra"].tolist(),
+                "placeholders": [
+                    {"key": int(k), "expected": pool.signatures[e], "found": pool.signatures[f]}
+                    for k, e, f in zip(result["placeholders"], result["expected"], result["found"])
+                ],
+            }
+            for kind in lang_report["totals"]:
+                lang_report["totals"][kind] += result[kind].size
+        report["languages"][lang] = lang_report
+
+    return report
+
+
+def has_issues(report: Dict) -> bool:
+    return any(
+        lang["missing_files"] or lang["extra_files"] or lang["files"]
+        for lang in report["languages"].values()
+    )
+
+
+def format_placeholders(signature: str) -> str:
+    return " ".join("%" + c for c in signature) or "none"
+
+
+def print_report(report: Dict, limit: int = 10):
+    """Print the per-language summary with up to limit example keys per file"""
+    def sample(keys) -> str:
+        shown = ", ".join(str(k) for k in keys[:limit])
+        return shown + (f", ... (+{len(keys) - limit})" if len(keys) > limit else "")
+
+    for lang, lang_report in report["languages"].items():
+        totals = lang_report["totals"]
+        clean = not (lang_report["missing_files"] or lang_report["extra_files"] or lang_report["files"])
+        print(f"\n{'✅' if clean else '❌'} {lang}: {totals['missing']} missing, {totals['extra']} extra, "
+              f"{totals['placeholders']} placeholder mismatches")
+        for name in lang_report["missing_files"]:
+            print(f"  ❌ {name}: file missing")
+        for name in lang_report["extra_files"]:
+            print(f"  ⚠️ {name}: not in {report['reference']}")
+        for name, result in lang_report["files"].items():
+            print(f"  {name}:")
+            if result["missing"]:
+                print(f"    missing {len(result['missing'])}: {sample(result['missing'])}")
+            if result["extra"]:
+                print(f"    extra {len(result['extra'])}: {sample(result['extra'])}")
+            for entry in result["placeholders"][:limit]:
+                print(f"    placeholders {{{entry['key']}}}: expected {format_placeholders(entry['expected'])}, "
+                      f"found {format_placeholders(entry['found'])}")
+            if len(result["placeholders"]) > limit:
+                print(f"    ... (+{len(result['placeholders']) - limit} placeholder mismatches)")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check every text/<lang>/*.MSG against the reference language")
+    parser.add_argument("--text-dir", help="Directory holding the language folders (default: <server>/text)")
+    parser.add_argument("--reference", default=DEFAULT_REFERENCE, help="Reference language directory")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--limit", type=int, default=10, help="Example keys printed per file")
+    parser.add_argument("--report", help="Write the full report as JSON")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="Path to aop-nightmare.cfg")
+
+    args = parser.parse_args()
+
+    text_dir = Path(args.text_dir) if args.text_dir else server_path(load_config(args.config)) / "text"
+    if not text_dir.is_dir():
+        print(f"❌ Text directory not found: {text_dir}")
+        sys.exit(1)
+
+    languages = discover_languages(text_dir)
+    if args.reference not in languages:
+        print(f"❌ Reference language '{args.reference}' not found in {text_dir}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    pool = FormatPool()
+    tables = load_tables(languages, pool, args.jobs)
+    report = check_languages(tables, pool, args.reference)
+    elapsed = time.perf_counter() - start
+
+    file_count = sum(len(files) for files in languages.values())
+    print(f"🔍 Checked {len(languages)} languages, {file_count} MSG files against "
+          f"{args.reference} in {elapsed:.2f}s")
+    print_report(report, args.limit)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Report saved to {args.report}")
+
+    sys.exit(1 if has_issues(report) else 0)
+
+
+if __name__ == "__main__":
+    main()
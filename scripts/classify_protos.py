@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+FOnline: Ashes of Phoenix Semantic Proto Classifier
+Batch-classifies every proto in protos.db against the [semantic_categories]
+of aop-nightmare.cfg and writes the winners back to the `category` column.
+
+Proto names, .fopro file names and MSG descriptions are tokenized once, turned
+into a sparse proto x token matrix and multiplied by a precomputed sparse
+token x category weight matrix, so the whole proto set is scored in one pass.
+
+Usage:
+    python scripts/classify_protos.py [--db data/protos.db] [--msg FOOBJ.MSG] [--dry-run]
+
+Requires numpy and scipy.
+"""
+
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from aop_config import DEFAULT_CONFIG, load_config, split_list
+from msg_reader import proto_texts, read_msg
+
+TOKEN_RE = re.compile(r"[a-z]+")
+
+# protos.type -> [semantic_categories] group; anything else is scenery
+TYPE_GROUPS = {0: "critters", 1: "items"}
+DEFAULT_GROUP = "scenery"
+# Groups whose categories are allowed for every proto type
+SHARED_GROUPS = ("base_protos",)
+
+CATEGORY_NAME_WEIGHT = 2.0
+# Shorter pieces of category names ("d" from "3d") match too much stray text;
+# such categories get their tokens from [semantic_keywords] instead
+MIN_NAME_TOKEN = 3
+KEYWORD_WEIGHT = 1.0
+EXCLUSION_WEIGHT = -2.0
+
+
+def normalize_token(token: str) -> str:
+    """Fold simple plurals so 'geckos' and 'gecko' hit the same column"""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+class SemanticClassifier:
+    def __init__(self, config_path: str = DEFAULT_CONFIG):
+        self.config = load_config(config_path)
+        self.categories: List[str] = []
+        self.groups: Dict[str, List[int]] = {}
+        self.vocab: Dict[str, int] = {}
+        self.weights = None  # token x category CSR matrix
+        self.build_rules()
+
+    def build_rules(self):
+        """Build the token -> category weight matrix from the cfg"""
+        semantic = self.config.get("semantic_categories", {})
+        keywords = self.config.get("semantic_keywords", {})
+
+        index = {}
+        for group, names in semantic.items():
+            self.groups[group] = []
+            for name in split_list(names):
+                if name not in index:
+                    index[name] = len(self.categories)
+                    self.categories.append(name)
+                self.groups[group].append(index[name])
+
+        rows, cols, vals = [], [], []
+
+        def add(token: str, category: int, weight: float):
+            token = normalize_token(token.lower())
+            if token not in self.vocab:
+                self.vocab[token] = len(self.vocab)
+            rows.append(self.vocab[token])
+            cols.append(category)
+            vals.append(weight)
+
+        for name, category in index.items():
+            for part in TOKEN_RE.findall(name.lower()):
+                if len(part) >= MIN_NAME_TOKEN:
+                    add(part, category, CATEGORY_NAME_WEIGHT)
+            for word in split_list(keywords.get(name, "")):
+                if word.startswith("-"):
+                    add(word[1:], category, EXCLUSION_WEIGHT)
+                else:
+                    add(word, category, KEYWORD_WEIGHT)
+
+        # Duplicate (token, category) pairs are summed by the COO -> CSR conversion
+        self.weights = sparse.coo_matrix(
+            (np.array(vals, dtype=np.float32), (np.array(rows), np.array(cols))),
+            shape=(len(self.vocab), len(self.categories)),
+        ).tocsr()
+
+    def group_mask(self, types: np.ndarray) -> np.ndarray:
+        """Boolean protos x categories mask of categories allowed per proto type"""
+        shared = [i for group in SHARED_GROUPS for i in self.groups.get(group, [])]
+        max_type = int(types.max()) if len(types) else 0
+        table = np.zeros((max_type + 1, len(self.categories)), dtype=bool)
+        for t in range(max_type + 1):
+            table[t, self.groups.get(TYPE_GROUPS.get(t, DEFAULT_GROUP), [])] = True
+            table[t, shared] = True
+        return table[types]
+
+    def term_matrix(self, texts: List[str]) -> sparse.csr_matrix:
+        """Tokenize every text once into a binary protos x vocab CSR matrix"""
+        indptr = [0]
+        indices: List[int] = []
+        vocab = self.vocab
+        lookup: Dict[str, int] = {}  # raw token -> vocab id or -1, normalized once
+        for text in texts:
+            hits = set()
+            for raw in set(TOKEN_RE.findall(text.lower())):
+                token_id = lookup.get(raw)
+                if token_id is None:
+                    token_id = lookup[raw] = vocab.get(normalize_token(raw), -1)
+                if token_id >= 0:
+                    hits.add(token_id)
+            indices.extend(hits)
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.float32)
+        return sparse.csr_matrix(
+            (data, np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=(len(texts), len(vocab)),
+        )
+
+    def classify(self, texts: List[str], types: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (category index or -1, score) for every text"""
+        scores = (self.term_matrix(texts) @ self.weights).toarray()
+        scores[~self.group_mask(types)] = 0.0
+        best = scores.argmax(axis=1)
+        best_score = scores[np.arange(len(texts)), best]
+        best[best_score <= 0.0] = -1
+        return best, best_score
+
+
+def load_protos(conn: sqlite3.Connection, msg_texts: Dict[int, str]):
+    """Read proto ids, types and searchable text in one query
+
+    The raw .fopro file name is used as-is: its extension never matches a rule.
+    """
+    rows = conn.execute(
+        "SELECT proto_id, type, name, description, source_file, category FROM protos"
+    ).fetchall()
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    types = np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows))
+    texts = [
+        " ".join((
+            r[2] or "",
+            r[3] or "",
+            r[4] or "",
+            msg_texts.get(r[0], ""),
+        ))
+        for r in rows
+    ]
+    current = [r[5] for r in rows]
+    return ids, types, texts, current
+
+
+def write_categories(conn: sqlite3.Connection, updates: List[Tuple[str, int]]):
+    """Write all changed protos.category values back in a single transaction
+
+    The curated `categories` table (Weapon, Armor, ... with descriptions) is
+    left alone; semantic category names only live on the protos.
+    """
+    with conn:
+        conn.executemany(
+            "UPDATE protos SET category = ?, updated_at = CURRENT_TIMESTAMP WHERE proto_id = ?",
+            updates,
+        )
+
+
+def run(db_path: str, config_path: str, msg_path: Optional[str], dry_run: bool) -> Dict:
+    """Classify every proto in the database and return run statistics"""
+    start = time.perf_counter()
+    classifier = SemanticClassifier(config_path)
+    msg_texts = proto_texts(read_msg(msg_path)) if msg_path else {}
+
+    conn = sqlite3.connect(db_path)
+    try:
+        ids, types, texts, current = load_protos(conn, msg_texts)
+        best, _ = classifier.classify(texts, types)
+
+        updates = []
+        counts = Counter()
+        for pid, idx, old in zip(ids.tolist(), best.tolist(), current):
+            # Protos no rule matches any more lose their stale category
+            name = classifier.categories[idx] if idx >= 0 else None
+            counts[name or "unclassified"] += 1
+            if name != old:
+                updates.append((name, pid))
+
+        if not dry_run and updates:
+            write_categories(conn, updates)
+    finally:
+        conn.close()
+
+    return {
+        "total": len(texts),
+        "changed": len(updates),
+        "categories": dict(counts),
+        "elapsed_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Classify protos by [semantic_categories]")
+    parser.add_argument("--db", default="data/protos.db", help="Path to protos.db")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="Path to aop-nightmare.cfg")
+    parser.add_argument("--msg", help="Optional FOOBJ.MSG for proto names/descriptions")
+    parser.add_argument("--dry-run", action="store_true", help="Classify without writing")
+
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"❌ Database not found: {args.db}")
+        sys.exit(1)
+
+    stats = run(args.db, args.config, args.msg, args.dry_run)
+
+    print(f"✅ Classified {stats['total']} protos in {stats['elapsed_ms']:.1f} ms")
+    print(f"  Changed: {stats['changed']}{' (dry run)' if args.dry_run else ''}")
+    for name, count in sorted(stats["categories"].items(), key=lambda kv: -kv[1]):
+        print(f"  {name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+FOnline .fomap Chunk Cooker
+Pre-cooks maps into fixed-size hex chunks so the editor only has to load the
+chunks inside the viewport instead of the whole 8 MB map.
+
+Each map becomes one <name>.fochunks file (little-endian):
+
+    file header   CHUNK_FILE_HEADER   magic 'OMCF', version, MaxHexX, MaxHexY,
+                                      chunk size, chunks x/y, string pool offset/size
+    directory     DIRECTORY_ENTRY     per chunk, row-major: blob offset, blob size,
+                  x chunks_x*chunks_y tile/roof/object counts, bounding box
+    map header    u32 count, then EXTRA_FIELD (key, value string indexes) per
+                  [Header] line, in file order
+    string pool   u32 count, then u16 length + UTF-8 bytes per string
+    chunk blobs   tiles  TILE_RECORD   hx, hy, art path string index
+                  roofs  TILE_RECORD
+                  objects OBJECT_RECORD MapX, MapY, MapObjType, presence flags,
+                                        extra count, ProtoId
+                          + extra count x (field string index, value string index)
+
+The presence flags mark which fixed fields the object really had, so missing
+fields stay missing. Only the file header, directory, map header and string
+pool are needed up front; every chunk blob can then be range-read or
+memory-mapped on its own.
+
+Cooking runs one map per worker process and is incremental: a manifest keeps
+the size and mtime of every source map, and unchanged maps are skipped.
+
+Usage:
+    python scripts/cook_chunks.py [maps...] [--out data/cooked-maps] [--chunk-size 32] [--jobs N] [--force]
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from aop_config import DEFAULT_CONFIG, load_config, server_path
+from fomap_parser import collect_sources, iter_fomap
+
+MAGIC_NUMBER = 0x46434D4F  # 'OMCF' - Orion Mapper Chunk Format
+VERSION = 2
+DEFAULT_CHUNK_SIZE = 32
+MANIFEST_NAME = "chunks-manifest.json"
+
+CHUNK_FILE_HEADER = struct.Struct("<IIHHHHHHII")
+DIRECTORY_ENTRY = struct.Struct("<IIIIIHHHH")
+TILE_RECORD = struct.Struct("<HHI")
+OBJECT_RECORD = struct.Struct("<HHBBHI")
+EXTRA_FIELD = struct.Struct("<II")
+
+# Fields stored in the fixed part of OBJECT_RECORD, with their presence flag
+# and largest storable value; anything else goes to the extra fields
+FIXED_OBJECT_FIELDS = {
+    "MapX": (0x01, 0xFFFF),
+    "MapY": (0x02, 0xFFFF),
+    "MapObjType": (0x04, 0xFF),
+    "ProtoId": (0x08, 0xFFFFFFFF),
+}
+
+EMPTY_BOUNDS = (0xFFFF, 0xFFFF, 0, 0)
+MAX_CHUNK_SIZE = 0xFFFF
+
+
+class StringPool:
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def add(self, value: str) -> int:
+        i = self.index.get(value)
+        if i is None:
+            i = self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return i
+
+    def pack(self) -> bytes:
+        parts = [struct.pack("<I", len(self.strings))]
+        for s in self.strings:
+            raw = s.encode("utf-8", "surrogateescape")
+            parts.append(struct.pack("<H", len(raw)))
+            parts.append(raw)
+        return b"".join(parts)
+
+
+class Chunk:
+    def __init__(self):
+        self.tiles = bytearray()
+        self.roofs = bytearray()
+        self.objects = bytearray()
+        self.tile_count = 0
+        self.roof_count = 0
+        self.object_count = 0
+        self.bounds = list(EMPTY_BOUNDS)
+
+    def extend_bounds(self, hx: int, hy: int):
+        b = self.bounds
+        b[0] = min(b[0], hx)
+        b[1] = min(b[1], hy)
+        b[2] = max(b[2], hx)
+        b[3] = max(b[3], hy)
+
+
+def _int(value: Optional[str], default: int = 0) -> int:
+    try:
+        return int(value) if value is not None else default
+    except ValueError:
+        return default
+
+
+def fixed_fields(item) -> Tuple[Dict[str, int], List[Tuple[str, str]], int]:
+    """Split an object into storable fixed fields, extra fields and presence flags"""
+    fixed: Dict[str, int] = {}
+    extras: List[Tuple[str, str]] = []
+    flags = 0
+    for k, v in item:
+        spec = FIXED_OBJECT_FIELDS.get(k)
+        if spec is not None and k not in fixed:
+            value = _int(v, -1)
+            if 0 <= value <= spec[1] and str(value) == v:
+                fixed[k] = value
+                flags |= spec[0]
+                continue
+        extras.append((k, v))
+    return fixed, extras, flags
+
+
+def cook_map(source: Path, target: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+    """Cook one .fomap into a .fochunks file and return its stats"""
+    if not 1 <= chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(f"Chunk size must be 1..{MAX_CHUNK_SIZE}, got {chunk_size}")
+    header: Dict[str, str] = {}
+    pool = StringPool()
+    chunks: Dict[Tuple[int, int], Chunk] = {}
+    unplaced: List[str] = []
+
+    def chunk_at(hx: int, hy: int) -> Chunk:
+        key = (hx // chunk_size, hy // chunk_size)
+        chunk = chunks.get(key)
+        if chunk is None:
+            chunk = chunks[key] = Chunk()
+        chunk.extend_bounds(hx, hy)
+        return chunk
+
+    for kind, item in iter_fomap(source):
+        if kind == "tile":
+            chunk = chunk_at(item.hx, item.hy)
+            record = TILE_RECORD.pack(item.hx, item.hy, pool.add(item.path))
+            if item.layer == "roof":
+                chunk.roofs += record
+                chunk.roof_count += 1
+            else:
+                chunk.tiles += record
+                chunk.tile_count += 1
+        elif kind == "object":
+            fixed, extras, flags = fixed_fields(item)
+            if "MapX" not in fixed or "MapY" not in fixed:
+                unplaced.append(dict(item).get("ProtoId", "?"))
+                continue
+            hx, hy = fixed["MapX"], fixed["MapY"]
+            chunk = chunk_at(hx, hy)
+            chunk.objects += OBJECT_RECORD.pack(
+                hx, hy, fixed.get("MapObjType", 0), flags, len(extras), fixed.get("ProtoId", 0),
+            )
+            for k, v in extras:
+                chunk.objects += EXTRA_FIELD.pack(pool.add(k), pool.add(v))
+            chunk.object_count += 1
+        else:
+            header[item[0]] = item[1]
+
+    max_x = _int(header.get("MaxHexX"), 400)
+    max_y = _int(header.get("MaxHexY"), 400)
+    chunks_x = max(1, -(-max_x // chunk_size))
+    chunks_y = max(1, -(-max_y // chunk_size))
+
+    header_block = bytearray(struct.pack("<I", len(header)))
+    for k, v in header.items():
+        header_block += EXTRA_FIELD.pack(pool.add(k), pool.add(v))
+
+    pool_bytes = pool.pack()
+    pool_offset = CHUNK_FILE_HEADER.size + DIRECTORY_ENTRY.size * chunks_x * chunks_y + len(header_block)
+    offset = pool_offset + len(pool_bytes)
+
+    directory = bytearray()
+    blobs = []
+    for cy in range(chunks_y):
+        for cx in range(chunks_x):
+            chunk = chunks.get((cx, cy))
+            if chunk is None:
+                directory += DIRECTORY_ENTRY.pack(offset, 0, 0, 0, 0, *EMPTY_BOUNDS)
+                continue
+            blob = bytes(chunk.tiles + chunk.roofs + chunk.objects)
+            directory += DIRECTORY_ENTRY.pack(
+                offset, len(blob), chunk.tile_count, chunk.roof_count, chunk.object_count,
+                *chunk.bounds,
+            )
+            blobs.append(blob)
+            offset += len(blob)
+
+    # Objects without a storable position would land in chunk (0, 0) otherwise
+    if unplaced:
+        raise ValueError(f"{source.name}: {len(unplaced)} objects without a valid MapX/MapY "
+                         f"(ProtoId {', '.join(unplaced[:5])})")
+
+    # Objects placed outside MaxHexX/MaxHexY would be silently dropped otherwise
+    outside = [k for k in chunks if k[0] >= chunks_x or k[1] >= chunks_y]
+    if outside:
+        raise ValueError(f"{source.name}: entities outside MaxHexX/MaxHexY in chunks {sorted(outside)[:5]}")
+
+    tmp = target.with_suffix(target.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(CHUNK_FILE_HEADER.pack(
+            MAGIC_NUMBER, VERSION, max_x, max_y, chunk_size, chunks_x, chunks_y, 0,
+            pool_offset, len(pool_bytes),
+        ))
+        f.write(directory)
+        f.write(header_block)
+        f.write(pool_bytes)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, target)
+
+    return {
+        "chunks": len(chunks),
+        "tiles": sum(c.tile_count + c.roof_count for c in chunks.values()),
+        "objects": sum(c.object_count for c in chunks.values()),
+        "bytes": offset,
+    }
+
+
+class ChunkFile:
+    """Lazy reader over a .fochunks file backed by mmap"""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.max_hex_x, self.max_hex_y, self.chunk_size,
+         self.chunks_x, self.chunks_y, _, pool_offset, pool_size) = CHUNK_FILE_HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC_NUMBER:
+            raise ValueError("Invalid chunk file format")
+        if version != VERSION:
+            raise ValueError(f"Unsupported chunk file version: {version}")
+        self.strings = self._read_pool(pool_offset)
+        directory_size = DIRECTORY_ENTRY.size * self.chunks_x * self.chunks_y
+        self.header = self._read_header(CHUNK_FILE_HEADER.size + directory_size)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_pool(self, offset: int) -> List[str]:
+        (count,) = struct.unpack_from("<I", self._map, offset)
+        offset += 4
+        strings = []
+        for _ in range(count):
+            (length,) = struct.unpack_from("<H", self._map, offset)
+            offset += 2
+            strings.append(self._map[offset:offset + length].decode("utf-8", "surrogateescape"))
+            offset += length
+        return strings
+
+    def _read_header(self, offset: int) -> Dict[str, str]:
+        (count,) = struct.unpack_from("<I", self._map, offset)
+        header = {}
+        for i in range(count):
+            k, v = EXTRA_FIELD.unpack_from(self._map, offset + 4 + i * EXTRA_FIELD.size)
+            header[self.strings[k]] = self.strings[v]
+        return header
+
+    def entry(self, cx: int, cy: int) -> Dict:
+        """Directory entry of one chunk"""
+        pos = CHUNK_FILE_HEADER.size + DIRECTORY_ENTRY.size * (cy * self.chunks_x + cx)
+        offset, size, tiles, roofs, objects, x0, y0, x1, y1 = DIRECTORY_ENTRY.unpack_from(self._map, pos)
+        return {"offset": offset, "size": size, "tiles": tiles, "roofs": roofs,
+                "objects": objects, "bounds": (x0, y0, x1, y1)}
+
+    def chunks_in_view(self, x0: int, y0: int, x1: int, y1: int) -> List[Tuple[int, int]]:
+        """Chunk coordinates overlapping a hex rectangle"""
+        cs = self.chunk_size
+        return [
+            (cx, cy)
+            for cy in range(max(0, y0 // cs), min(self.chunks_y - 1, y1 // cs) + 1)
+            for cx in range(max(0, x0 // cs), min(self.chunks_x - 1, x1 // cs) + 1)
+        ]
+
+    def read_chunk(self, cx: int, cy: int) -> Dict:
+        """Decode one chunk into tiles, roofs and objects"""
+        e = self.entry(cx, cy)
+        strings = self.strings
+        pos = e["offset"]
+
+        def read_tiles(count, layer, pos):
+            tiles = []
+            for _ in range(count):
+                hx, hy, path = TILE_RECORD.unpack_from(self._map, pos)
+                tiles.append({"layer": layer, "hexX": hx, "hexY": hy, "path": strings[path]})
+                pos += TILE_RECORD.size
+            return tiles, pos
+
+        tiles, pos = read_tiles(e["tiles"], "tile", pos)
+        roofs, pos = read_tiles(e["roofs"], "roof", pos)
+
+        objects = []
+        for _ in range(e["objects"]):
+            hx, hy, obj_type, flags, extra_count, proto = OBJECT_RECORD.unpack_from(self._map, pos)
+            pos += OBJECT_RECORD.size
+            values = {"MapObjType": obj_type, "ProtoId": proto, "MapX": hx, "MapY": hy}
+            obj = {k: values[k] for k, (flag, _) in FIXED_OBJECT_FIELDS.items() if flags & flag}
+            for _ in range(extra_count):
+                k, v = EXTRA_FIELD.unpack_from(self._map, pos)
+                obj[strings[k]] = strings[v]
+                pos += EXTRA_FIELD.size
+            objects.append(obj)
+
+        return {"tiles": tiles, "roofs": roofs, "objects": objects}
+
+
+def _cook_job(args) -> Tuple[str, Optional[Dict], Optional[str]]:
+    source, target, chunk_size = args
+    try:
+        return source, cook_map(Path(source), Path(target), chunk_size), None
+    except (OSError, ValueError, struct.error) as e:
+        return source, None, str(e)
+
+
+def source_stamp(path: Path) -> Dict:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def cook_corpus(sources: List[Path], out_dir: Path, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                jobs: Optional[int] = None, force: bool = False) -> Dict:
+    """Cook every changed map in parallel and update the manifest"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+    manifest = {}
+    if manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    entries = manifest.get("maps", {}) if manifest.get("version") == VERSION else {}
+
+    todo = []
+    stamps = {}
+    for source in sources:
+        target = out_dir / (source.stem + ".fochunks")
+        stamp = dict(source_stamp(source), chunk_size=chunk_size)
+        stamps[str(source)] = (source.stem, stamp)
+        if not force and target.exists() and entries.get(source.stem, {}).get("source") == stamp:
+            continue
+        todo.append((str(source), str(target), chunk_size))
+
+    errors = {}
+    cooked = 0
+    if todo:
+        workers = min(jobs or os.cpu_count() or 1, len(todo))
+        with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as pool:
+            if pool is None:
+                results = map(_cook_job, todo)
+            else:
+                results = pool.map(_cook_job, todo, chunksize=max(1, len(todo) // (workers * 4)))
+            for source, stats, error in results:
+                name, stamp = stamps[source]
+                if error:
+                    errors[name] = error
+                    entries.pop(name, None)
+                    continue
+                entries[name] = {"source": stamp, "stats": stats}
+                cooked += 1
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"version": VERSION, "maps": entries}, f, indent=2, sort_keys=True)
+
+    return {"total": len(sources), "cooked": cooked, "skipped": len(sources) - len(todo), "errors": errors}
+
+
+def chunk_size_arg(value: str) -> int:
+    """argparse type for --chunk-size: the format stores it as a u16"""
+    import argparse
+
+    size = int(value)
+    if not 1 <= size <= MAX_CHUNK_SIZE:
+        raise argparse.ArgumentTypeError(f"must be 1..{MAX_CHUNK_SIZE}, got {size}")
+    return size
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pre-cook .fomap files into viewport chunks")
+    parser.add_argument("maps", nargs="*", help="Map files or directories (default: <server>/maps)")
+    parser.add_argument("--out", default="data/cooked-maps", help="Output directory")
+    parser.add_argument("--chunk-size", type=chunk_size_arg, default=DEFAULT_CHUNK_SIZE, help="Chunk edge in hexes")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="Re-cook unchanged maps")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="Path to aop-nightmare.cfg")
+
+    args = parser.parse_args()
+
+    inputs = args.maps or [str(server_path(load_config(args.config)) / "maps")]
+    sources = collect_sources(inputs)
+    if not sources:
+        print("❌ No .fomap files found")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    result = cook_corpus(sources, Path(args.out), args.chunk_size, args.jobs, args.force)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Cooked {result['cooked']} maps, skipped {result['skipped']} unchanged "
+          f"({result['total']} total) in {elapsed:.2f}s")
+    for name, error in result["errors"].items():
+        print(f"  ❌ {name}: {error}")
+
+    sys.exit(1 if result["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+FOnline .fomap reader/writer
+Python counterpart of src/serialization/FomapParser.js and FomapSerializer.js.
+
+Values are kept as the strings found in the file so a read/write round trip
+does not reformat anything. Objects are tuples of (field, value) pairs in file
+order: hashable, compact, and cheap to compare when diffing large maps.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Value column start position for header and object fields
+VALUE_COLUMN = 21
+
+# Tile lines are column based: "tile       108  20             art\tiles\EDG5001.frm"
+TILE_LAYERS = ("tile", "roof")
+
+# Files are read with surrogateescape so non-UTF-8 art paths survive a round trip
+ENCODING = "utf-8"
+ERRORS = "surrogateescape"
+
+MapObject = Tuple[Tuple[str, str], ...]
+
+
+class Tile(NamedTuple):
+    layer: str
+    hx: int
+    hy: int
+    path: str
+
+
+class FomapData:
+    def __init__(self):
+        self.header: Dict[str, str] = {}
+        self.tiles: List[Tile] = []
+        self.objects: List[MapObject] = []
+
+    @property
+    def max_hex(self) -> Tuple[int, int]:
+        """(MaxHexX, MaxHexY), defaulting to the editor's 400x400"""
+        return (int(self.header.get("MaxHexX", 400)), int(self.header.get("MaxHexY", 400)))
+
+
+def obj_get(obj: MapObject, field: str, default: Optional[str] = None) -> Optional[str]:
+    """Return the value of a field in an object tuple"""
+    for name, value in obj:
+        if name == field:
+            return value
+    return default
+
+
+def obj_int(obj: MapObject, field: str, default: int = 0) -> int:
+    """Return a numeric field of an object tuple"""
+    value = obj_get(obj, field)
+    try:
+        return int(value) if value is not None else default
+    except ValueError:
+        return default
+
+
+def iter_fomap(path) -> Iterator[Tuple[str, object]]:
+    """Stream a .fomap file as ('header', (field, value)), ('tile', Tile), ('object', MapObject)"""
+    section = None
+    fields: List[Tuple[str, str]] = []
+    intern: Dict[str, str] = {}  # shared strings keep large maps compact
+
+    with open(path, "r", encoding=ENCODING, errors=ERRORS) as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+
+            if line.startswith("["):
+                if fields:
+                    yield "object", tuple(fields)
+                    fields = []
+                section = line.strip()[1:-1].lower()
+                continue
+
+            if not line.strip():
+                if section == "objects" and fields:
+                    yield "object", tuple(fields)
+                    fields = []
+                continue
+
+            parts = line.split(None, 1)
+            if len(parts) < 2:
+                continue
+            field = intern.setdefault(parts[0], parts[0])
+
+            if section == "header":
+                yield "header", (field, parts[1])
+            elif section == "tiles":
+                cols = parts[1].split(None, 2)
+                if field in TILE_LAYERS and len(cols) == 3 and cols[0].isdigit() and cols[1].isdigit():
+                    path_value = cols[2].strip()
+                    yield "tile", Tile(field, int(cols[0]), int(cols[1]), intern.setdefault(path_value, path_value))
+            elif section == "objects":
+                value = parts[1].strip()
+                if field == "MapObjType" and fields:
+                    yield "object", tuple(fields)
+                    fields = []
+                if field == "MapObjType" or fields:
+                    fields.append((field, intern.setdefault(value, value)))
+
+    if fields:
+        yield "object", tuple(fields)
+
+
+def read_fomap(path) -> FomapData:
+    """Read a whole .fomap file"""
+    data = FomapData()
+    for kind, item in iter_fomap(path):
+        if kind == "tile":
+            data.tiles.append(item)
+        elif kind == "object":
+            data.objects.append(item)
+        else:
+            data.header[item[0]] = item[1]
+    return data
+
+
+def read_header(path) -> Dict[str, str]:
+    """Read only the [Header] block of a .fomap file"""
+    header = {}
+    with open(path, "r", encoding=ENCODING, errors=ERRORS) as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if line.startswith("[") and line.strip() != "[Header]":
+                break
+            parts = line.split(None, 1)
+            if len(parts) == 2:
+                header[parts[0]] = parts[1]
+    return header
+
+
+def format_field(field: str, value) -> str:
+    """Format a field-value line with the value at VALUE_COLUMN"""
+    return field + " " * max(1, VALUE_COLUMN - len(field)) + str(value)
+
+
+def format_tile(tile: Tile) -> str:
+    """Format a tile line with the column layout used by the game's mapper"""
+    return f"{tile.layer:<11}{tile.hx:<5}{tile.hy:<15}{tile.path}"
+
+
+def serialize_fomap(data: FomapData) -> str:
+    """Serialize map data back to .fomap text"""
+    lines = ["[Header]"]
+    lines.extend(format_field(k, v) for k, v in data.header.items())
+    lines.append("")
+    lines.append("[Tiles]")
+    lines.extend(format_tile(t) for t in data.tiles)
+    lines.append("")
+    lines.append("[Objects]")
+    for obj in data.objects:
+        lines.extend(format_field(k, v) for k, v in obj)
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def write_fomap(data: FomapData, path):
+    """Write map data to a .fomap file"""
+    Path(path).write_text(serialize_fomap(data), encoding=ENCODING, errors=ERRORS)
+
+
+def collect_sources(inputs: List[str]) -> List[Path]:
+    """Expand directories into their .fomap files"""
+    sources = []
+    for item in inputs:
+        p = Path(item)
+        if p.is_dir():
+            sources.extend(sorted(p.glob("*.fomap")))
+        elif p.exists():
+            sources.append(p)
+        else:
+            print(f"⚠️ Not found: {p}")
+    return sources
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Shared in-process cache for the generated JSON indexes
+Every index file is read and parsed at most once per run, no matter how many
+validators ask for it. An optional pickled snapshot carries parsed indexes
+across runs and is trusted only while each source file's size and mtime match.
+"""
+
+import json
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DB_DIR = Path("source/database")
+
+SNAPSHOT_VERSION = 1
+
+_MISSING = object()
+
+
+def file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """(size, mtime_ns) of a file, or None when it does not exist"""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+class IndexCache:
+    def __init__(self, db_dir=DB_DIR, snapshot: Optional[str] = None):
+        self.db_dir = Path(db_dir)
+        self.snapshot = Path(snapshot) if snapshot else None
+        self._data: Dict[str, Any] = {}
+        self._stamps: Dict[str, Tuple[int, int]] = {}
+        self._snapshot_entries: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self._dirty = False
+        self.parsed = 0  # files parsed with json.load during this run
+        self.restored = 0  # files taken from the pickle snapshot
+        if self.snapshot:
+            self._read_snapshot()
+
+    def get(self, name: str) -> Optional[Any]:
+        """Parsed index from the database directory, or None if it does not exist"""
+        return self.load(self.db_dir / name)
+
+    def load(self, path) -> Optional[Any]:
+        """Parsed JSON file by path, memoized for the rest of the run
+
+        Raises json.JSONDecodeError for invalid files like json.load does.
+        """
+        key = str(path)
+        value = self._data.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        stamp = file_stamp(Path(path))
+        if stamp is None:
+            self._data[key] = None
+            return None
+
+        cached = self._snapshot_entries.get(key)
+        if cached is not None and cached[0] == stamp:
+            value = cached[1]
+            self.restored += 1
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            self.parsed += 1
+            self._dirty = True
+
+        self._data[key] = value
+        self._stamps[key] = stamp
+        return value
+
+    def _read_snapshot(self):
+        try:
+            with open(self.snapshot, "rb") as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return
+        if isinstance(payload, dict) and payload.get("version") == SNAPSHOT_VERSION:
+            self._snapshot_entries = payload.get("entries", {})
+
+    def save_snapshot(self) -> bool:
+        """Write every index loaded this run (plus still-valid old entries) to the snapshot"""
+        if not self.snapshot or not self._dirty:
+            return False
+        entries = {
+            key: (stamp, value)
+            for key, (stamp, value) in self._snapshot_entries.items()
+            if file_stamp(Path(key)) == stamp
+        }
+        entries.update({key: (self._stamps[key], self._data[key]) for key in self._stamps})
+        self.snapshot.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.snapshot.with_suffix(self.snapshot.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": SNAPSHOT_VERSION, "entries": entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(self.snapshot)
+        self._dirty = False
+        return True
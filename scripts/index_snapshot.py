@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+Binary snapshots of the generated JSON indexes
+Writes source/database/*.json and data/string-mappings.json as versioned
+.fosnap files that open in milliseconds instead of being re-parsed by json.load.
+
+A JSON document is flattened breadth-first into a node table of fixed-width
+columns, so the children of every array/object are contiguous:
+
+    kind   u8   null, false, true, int, float, string, array, object, bigint
+    value  i64  int value | float bits | string id | first child node
+    count  u32  number of children (arrays/objects)
+    key    u32  string id of the key (children of objects)
+    order  u32  children of objects: sorted slot of the n-th key in document order
+
+Strings (keys and values) are interned into one pool sorted by UTF-8 bytes,
+and the children of every object are stored sorted by key id, so a key lookup
+is a binary search over the pool plus a searchsorted over the key column.
+Every column and the pool are plain buffers in the file, 8-byte aligned, and
+are memory-mapped by the loader; nothing is decoded until it is accessed. Objects and arrays come back as read-only
+Mapping/Sequence views that read like parsed JSON.
+
+The header records the source JSON's size, mtime and BLAKE2 digest so a
+snapshot can be checked for staleness without parsing anything.
+
+Usage:
+    python scripts/index_snapshot.py build [files...]
+    python scripts/index_snapshot.py check [files...]
+    python scripts/index_snapshot.py bench <file.json> [--lookups 100]
+
+Requires numpy.
+"""
+
+import bisect
+import hashlib
+import json
+import mmap
+import struct
+import sys
+import time
+from collections import deque
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+MAGIC = b"OMIS"  # Orion Mapper Index Snapshot
+VERSION = 1
+SUFFIX = ".fosnap"
+
+# magic, version, node count, string count, source size, source mtime_ns, source digest,
+# offsets of kind/value/count/key/order columns, string offsets, string data, string data size
+HEADER = struct.Struct("<4sIQQQQ16sQQQQQQQQ")
+
+KIND_NULL, KIND_FALSE, KIND_TRUE, KIND_INT, KIND_FLOAT, KIND_STRING, KIND_ARRAY, KIND_OBJECT, KIND_BIGINT = range(9)
+NO_KEY = 0xFFFFFFFF
+
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+DEFAULT_SOURCES = ("source/database/*.json", "data/string-mappings.json")
+
+FLOAT_TO_BITS = struct.Struct("<d")
+BITS_TO_INT = struct.Struct("<q")
+
+
+def snapshot_path(source) -> Path:
+    return Path(source).with_suffix(SUFFIX)
+
+
+def source_digest(path) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.digest()
+
+
+def _encode(s: str) -> bytes:
+    return s.encode("utf-8", "surrogatepass")
+
+
+def write_snapshot(source, target=None) -> Path:
+    """Convert one JSON file into a .fosnap snapshot"""
+    source = Path(source)
+    target = Path(target) if target else snapshot_path(source)
+    st = source.stat()
+    with open(source, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+
+    # Pass 1: intern every string, ids in UTF-8 byte order
+    strings = set()
+    stack = [doc]
+    while stack:
+        v = stack.pop()
+        if isinstance(v, dict):
+            strings.update(v.keys())
+            stack.extend(v.values())
+        elif isinstance(v, list):
+            stack.extend(v)
+        elif isinstance(v, str):
+            strings.add(v)
+        elif isinstance(v, int) and not isinstance(v, bool) and not INT64_MIN <= v <= INT64_MAX:
+            strings.add(str(v))
+    pool = sorted((_encode(s), s) for s in strings)
+    string_ids = {s: i for i, (_, s) in enumerate(pool)}
+
+    # Pass 2: breadth-first node table
+    kinds: List[int] = []
+    values: List[int] = []
+    counts: List[int] = []
+    keys: List[int] = []
+    order: List[int] = []
+    queue = deque()
+
+    def emit(v, key_id: int):
+        idx = len(kinds)
+        keys.append(key_id)
+        order.append(0)
+        counts.append(0)
+        if v is None:
+            kinds.append(KIND_NULL); values.append(0)
+        elif v is True:
+            kinds.append(KIND_TRUE); values.append(1)
+        elif v is False:
+            kinds.append(KIND_FALSE); values.append(0)
+        elif isinstance(v, int):
+            if INT64_MIN <= v <= INT64_MAX:
+                kinds.append(KIND_INT); values.append(v)
+            else:
+                kinds.append(KIND_BIGINT); values.append(string_ids[str(v)])
+        elif isinstance(v, float):
+            kinds.append(KIND_FLOAT); values.append(BITS_TO_INT.unpack(FLOAT_TO_BITS.pack(v))[0])
+        elif isinstance(v, str):
+            kinds.append(KIND_STRING); values.append(string_ids[v])
+        else:
+            kinds.append(KIND_OBJECT if isinstance(v, dict) else KIND_ARRAY)
+            values.append(0)
+            queue.append((idx, v))
+
+    emit(doc, NO_KEY)
+    while queue:
+        idx, v = queue.popleft()
+        values[idx] = len(kinds)
+        counts[idx] = len(v)
+        if isinstance(v, dict):
+            ranked = sorted((string_ids[k], pos, child) for pos, (k, child) in enumerate(v.items()))
+            start = len(kinds)
+            for sid, _, child in ranked:
+                emit(child, sid)
+            for slot, (_, pos, _) in enumerate(ranked):
+                order[start + pos] = slot
+        else:
+            for child in v:
+                emit(child, NO_KEY)
+
+    encoded = [b for b, _ in pool]
+    str_offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    if encoded:
+        np.cumsum([len(b) for b in encoded], out=str_offsets[1:])
+    columns = [
+        np.array(kinds, dtype="<u1").tobytes(),
+        np.array(values, dtype="<i8").tobytes(),
+        np.array(counts, dtype="<u4").tobytes(),
+        np.array(keys, dtype="<u4").tobytes(),
+        np.array(order, dtype="<u4").tobytes(),
+        str_offsets.tobytes(),
+        b"".join(encoded),
+    ]
+
+    offsets = []
+    pos = HEADER.size
+    for col in columns:
+        pos = (pos + 7) & ~7
+        offsets.append(pos)
+        pos += len(col)
+
+    tmp = target.with_suffix(target.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(kinds), len(encoded), st.st_size, st.st_mtime_ns,
+                            source_digest(source), *offsets, len(columns[-1])))
+        for off, col in zip(offsets, columns):
+            f.write(b"\0" * (off - f.tell()))
+            f.write(col)
+    tmp.replace(target)
+    return target
+
+
+class Snapshot:
+    """Memory-mapped .fosnap file
+
+    Close it (or use it as a context manager) before rewriting the file:
+    Windows cannot replace a file that is still mapped. Views taken from a
+    closed snapshot must not be used.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, nodes, n_strings, self.source_size, self.source_mtime_ns, self.source_digest,
+         kind_off, value_off, count_off, key_off, order_off, stroff_off, strdata_off,
+         strdata_size) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an index snapshot: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}: {path}")
+
+        buf = self._mm
+        self.kind = np.frombuffer(buf, dtype="<u1", count=nodes, offset=kind_off)
+        self.value = np.frombuffer(buf, dtype="<i8", count=nodes, offset=value_off)
+        self.count = np.frombuffer(buf, dtype="<u4", count=nodes, offset=count_off)
+        self.key = np.frombuffer(buf, dtype="<u4", count=nodes, offset=key_off)
+        self.order = np.frombuffer(buf, dtype="<u4", count=nodes, offset=order_off)
+        # bisect over a memoryview runs in C without creating numpy scalars
+        if sys.byteorder == "little":
+            self.key_seq = memoryview(buf)[key_off:key_off + 4 * nodes].cast("I")
+        else:
+            self.key_seq = self.key.tolist()
+        self._str_offsets = np.frombuffer(buf, dtype="<u8", count=n_strings + 1, offset=stroff_off).tolist()
+        self._str_base = strdata_off
+        self._n_strings = n_strings
+        self._strings: Dict[int, str] = {}
+        self._ids: Dict[str, Optional[int]] = {}
+
+    def close(self):
+        """Drop the column views and unmap the file"""
+        if self._mm.closed:
+            return
+        if isinstance(self.key_seq, memoryview):
+            self.key_seq.release()
+        # The numpy columns export the mapping's buffer; it cannot close while they exist
+        self.kind = self.value = self.count = self.key = self.order = self.key_seq = None
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def root(self) -> Any:
+        return self.node(0)
+
+    def string(self, sid: int) -> str:
+        s = self._strings.get(sid)
+        if s is None:
+            base = self._str_base
+            raw = self._mm[base + self._str_offsets[sid]:base + self._str_offsets[sid + 1]]
+            s = self._strings[sid] = raw.decode("utf-8", "surrogatepass")
+        return s
+
+    def string_id(self, s: str) -> Optional[int]:
+        """Binary search the sorted pool; None if the string never occurs"""
+        if s in self._ids:
+            return self._ids[s]
+        target = _encode(s)
+        mm, base, offs = self._mm, self._str_base, self._str_offsets
+        lo, hi = 0, self._n_strings
+        found = None
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = mm[base + offs[mid]:base + offs[mid + 1]]
+            if probe < target:
+                lo = mid + 1
+            elif probe > target:
+                hi = mid
+            else:
+                found = mid
+                break
+        self._ids[s] = found
+        return found
+
+    def node(self, i: int) -> Any:
+        kind = self.kind[i]
+        if kind == KIND_STRING:
+            return self.string(int(self.value[i]))
+        if kind == KIND_INT:
+            return int(self.value[i])
+        if kind == KIND_OBJECT:
+            return SnapshotObject(self, int(self.value[i]), int(self.count[i]))
+        if kind == KIND_ARRAY:
+            return SnapshotArray(self, int(self.value[i]), int(self.count[i]))
+        if kind == KIND_FLOAT:
+            return FLOAT_TO_BITS.unpack(BITS_TO_INT.pack(int(self.value[i])))[0]
+        if kind == KIND_TRUE:
+            return True
+        if kind == KIND_FALSE:
+            return False
+        if kind == KIND_BIGINT:
+            return int(self.string(int(self.value[i])))
+        return None
+
+    def is_stale(self, source) -> bool:
+        return is_stale_stamp(self.source_size, self.source_mtime_ns, self.source_digest, source)
+
+
+def materialize(value: Any) -> Any:
+    """Turn snapshot views into plain dicts and lists"""
+    if isinstance(value, SnapshotObject):
+        return {k: materialize(v) for k, v in value.items()}
+    if isinstance(value, SnapshotArray):
+        return [materialize(v) for v in value]
+    return value
+
+
+class SnapshotObject(Mapping):
+    """Read-only dict view over an object node"""
+
+    __slots__ = ("_snap", "_start", "_count")
+
+    def __init__(self, snap: Snapshot, start: int, count: int):
+        self._snap = snap
+        self._start = start
+        self._count = count
+
+    def _index(self, key) -> Optional[int]:
+        if not isinstance(key, str):
+            return None
+        sid = self._snap.string_id(key)
+        if sid is None:
+            return None
+        keys = self._snap.key_seq
+        end = self._start + self._count
+        i = bisect.bisect_left(keys, sid, self._start, end)
+        return i if i < end and keys[i] == sid else None
+
+    def __getitem__(self, key):
+        i = self._index(key)
+        if i is None:
+            raise KeyError(key)
+        return self._snap.node(i)
+
+    def __contains__(self, key):
+        return self._index(key) is not None
+
+    def _document_order(self) -> List[int]:
+        return (self._snap.order[self._start:self._start + self._count] + self._start).tolist()
+
+    def __iter__(self):
+        snap = self._snap
+        for i in self._document_order():
+            yield snap.string(int(snap.key[i]))
+
+    def __len__(self):
+        return self._count
+
+    def items(self):
+        snap = self._snap
+        nodes = self._document_order()
+        key_ids = snap.key[nodes].tolist()
+        return [(snap.string(sid), snap.node(i)) for sid, i in zip(key_ids, nodes)]
+
+    def values(self):
+        return [self._snap.node(i) for i in self._document_order()]
+
+    def __repr__(self):
+        return f"<SnapshotObject {self._count} keys>"
+
+
+class SnapshotArray(Sequence):
+    """Read-only list view over an array node"""
+
+    __slots__ = ("_snap", "_start", "_count")
+
+    def __init__(self, snap: Snapshot, start: int, count: int):
+        self._snap = snap
+        self._start = start
+        self._count = count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return self._snap.node(self._start + i)
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        node = self._snap.node
+        for i in range(self._start, self._start + self._count):
+            yield node(i)
+
+    def __repr__(self):
+        return f"<SnapshotArray {self._count} items>"
+
+
+def is_stale_stamp(size: int, mtime_ns: int, digest: bytes, source) -> bool:
+    """Compare a recorded stamp with the source JSON; hashes only when size matches but mtime does not"""
+    try:
+        st = Path(source).stat()
+    except OSError:
+        return True
+    if st.st_size != size:
+        return True
+    if st.st_mtime_ns == mtime_ns:
+        return False
+    return source_digest(source) != digest
+
+
+def is_stale(source, target=None) -> bool:
+    """True when the snapshot for a JSON file is missing, unreadable or out of date"""
+    target = Path(target) if target else snapshot_path(source)
+    try:
+        with open(target, "rb") as f:
+            head = f.read(HEADER.size)
+        magic, version, _, _, size, mtime_ns, digest, *_ = HEADER.unpack(head)
+    except (OSError, struct.error):
+        return True
+    if magic != MAGIC or version != VERSION:
+        return True
+    return is_stale_stamp(size, mtime_ns, digest, source)
+
+
+def open_fresh(source) -> Optional[Snapshot]:
+    """Open the snapshot of a JSON file if it exists and is up to date"""
+    if is_stale(source):
+        return None
+    return Snapshot(snapshot_path(source))
+
+
+def expand_sources(patterns) -> List[Path]:
+    files = []
+    for pattern in patterns:
+        p = Path(pattern)
+        if any(c in pattern for c in "*?["):
+            files.extend(sorted(Path().glob(pattern)))
+        elif p.exists():
+            files.append(p)
+    return files
+
+
+def bench(source, lookups: int = 100, repeat: int = 5) -> Dict[str, float]:
+    """Best-of-N timings: json.load vs opening the snapshot, plus the same key lookups on both"""
+    source = Path(source)
+    if is_stale(source):
+        write_snapshot(source)
+
+    with open(source, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+
+    # Look up keys of the largest top-level object, the typical validator access
+    container_key = max((k for k, v in doc.items() if isinstance(v, (dict, list))),
+                        key=lambda k: len(doc[k]), default=None) if isinstance(doc, dict) else None
+    container = doc[container_key] if container_key is not None else doc
+    if isinstance(container, dict):
+        probe = list(container.keys())[:: max(1, len(container) // lookups)][:lookups]
+    else:
+        probe = list(range(0, len(container), max(1, len(container) // lookups)))[:lookups]
+
+    def run_json():
+        with open(source, "r", encoding="utf-8") as f:
+            d = json.load(f)
+        c = d[container_key] if container_key is not None else d
+        return len([c[k] for k in probe])
+
+    def run_snapshot():
+        with Snapshot(snapshot_path(source)) as snap:
+            c = snap.root[container_key] if container_key is not None else snap.root
+            return len([c[k] for k in probe])
+
+    def best(fn):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    def open_only():
+        with Snapshot(snapshot_path(source)) as snap:
+            return len(snap.root)
+
+    json_s = best(run_json)
+    snap_s = best(run_snapshot)
+    return {
+        "json_load_ms": json_s * 1000,
+        "snapshot_open_ms": best(open_only) * 1000,
+        "snapshot_ms": snap_s * 1000,
+        "lookups": len(probe),
+        "speedup": json_s / snap_s if snap_s else float("inf"),
+    }
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Binary snapshots of the generated JSON indexes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="Write snapshots for stale or missing files")
+    p_build.add_argument("files", nargs="*", default=list(DEFAULT_SOURCES))
+    p_build.add_argument("--force", action="store_true", help="Rewrite fresh snapshots too")
+    p_check = sub.add_parser("check", help="List stale snapshots")
+    p_check.add_argument("files", nargs="*", default=list(DEFAULT_SOURCES))
+    p_bench = sub.add_parser("bench", help="Compare json.load with the snapshot loader")
+    p_bench.add_argument("file")
+    p_bench.add_argument("--lookups", type=int, default=100)
+
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        r = bench(args.file, args.lookups)
+        print(f"json.load + {r['lookups']} lookups: {r['json_load_ms']:.2f} ms")
+        print(f"snapshot open:                {r['snapshot_open_ms']:.3f} ms")
+        print(f"snapshot + {r['lookups']} lookups:  {r['snapshot_ms']:.2f} ms")
+        print(f"Speedup: {r['speedup']:.1f}x")
+        return
+
+    files = expand_sources(args.files)
+    stale = [f for f in files if is_stale(f)]
+
+    if args.command == "check":
+        for f in stale:
+            print(f"⚠️ Stale snapshot: {snapshot_path(f)}")
+        print(f"{len(files) - len(stale)}/{len(files)} snapshots up to date")
+        sys.exit(1 if stale else 0)
+
+    for f in (files if args.force else stale):
+        start = time.perf_counter()
+        target = write_snapshot(f)
+        print(f"✅ {target} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+    print(f"{len(files)} sources, {len(files if args.force else stale)} snapshots written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+FOnline .fomap Structural Diff
+Compares two versions of a map entity by entity instead of line by line.
+
+Tiles are keyed by (hx, hy, layer). Objects are keyed by UID when the map
+has one, otherwise by (MapObjType, ProtoId, MapX, MapY); objects left over on
+both sides are then paired by their non-positional fields to detect moves.
+Every step is a hash join, so the diff is linear in the size of both maps.
+
+Usage:
+    python scripts/map_diff.py <old.fomap> <new.fomap> [--patch out.json] [--json]
+    python scripts/map_diff.py apply <old.fomap> <patch.json> <out.fomap>
+"""
+
+import json
+import sys
+from collections import defaultdict, deque
+from typing import Dict, List, Tuple
+
+from fomap_parser import FomapData, MapObject, Tile, iter_fomap, obj_get, read_fomap, write_fomap
+
+PATCH_FORMAT = "fomap-patch"
+PATCH_VERSION = 1
+
+POSITION_FIELDS = ("MapX", "MapY")
+
+TileKey = Tuple[int, int, str]
+
+
+class MapSide:
+    """Hash-indexed tiles and objects of one map version"""
+
+    def __init__(self, path):
+        self.header: Dict[str, str] = {}
+        self.tiles: Dict[TileKey, List[str]] = defaultdict(list)
+        self.objects: Dict[tuple, List[MapObject]] = defaultdict(list)
+        for kind, item in iter_fomap(path):
+            if kind == "tile":
+                self.tiles[(item.hx, item.hy, item.layer)].append(item.path)
+            elif kind == "object":
+                self.objects[object_key(item)].append(item)
+            else:
+                self.header[item[0]] = item[1]
+
+
+def object_key(obj: MapObject) -> tuple:
+    """Identity of an object: its UID, or its type, proto and position"""
+    fields = dict(obj)
+    uid = fields.get("UID")
+    if uid and uid != "0":
+        return ("uid", uid)
+    return ("pos", fields.get("MapObjType"), fields.get("ProtoId"),
+            fields.get("MapX"), fields.get("MapY"))
+
+
+def object_signature(obj: MapObject) -> MapObject:
+    """Everything except the position, used to recognise moved objects"""
+    return tuple(sorted(f for f in obj if f[0] not in POSITION_FIELDS))
+
+
+def field_delta(old: MapObject, new: MapObject) -> Tuple[Dict[str, str], List[str]]:
+    """Fields to set and to remove to turn old into new"""
+    old_fields = dict(old)
+    new_fields = dict(new)
+    changed = {k: v for k, v in new_fields.items() if old_fields.get(k) != v}
+    removed = [k for k in old_fields if k not in new_fields]
+    return changed, removed
+
+
+def position(obj: MapObject) -> List[int]:
+    return [int(obj_get(obj, "MapX", "0")), int(obj_get(obj, "MapY", "0"))]
+
+
+def diff_tiles(old: MapSide, new: MapSide) -> Dict[str, list]:
+    """Added, removed and changed tiles by (hx, hy, layer)"""
+    result = {"added": [], "removed": [], "changed": []}
+    for key, old_paths in old.tiles.items():
+        new_paths = new.tiles.get(key)
+        if new_paths is None:
+            result["removed"].append([*key, old_paths])
+        elif sorted(old_paths) != sorted(new_paths):
+            result["changed"].append([*key, old_paths, new_paths])
+    for key, new_paths in new.tiles.items():
+        if key not in old.tiles:
+            result["added"].append([*key, new_paths])
+    return result
+
+
+def diff_objects(old: MapSide, new: MapSide) -> Dict[str, list]:
+    """Added, removed, moved and changed objects"""
+    result = {"added": [], "removed": [], "moved": [], "changed": []}
+    unmatched_old: List[MapObject] = []
+    unmatched_new: List[MapObject] = []
+
+    # Pass 1: join on identity
+    for key, old_objs in old.objects.items():
+        new_objs = new.objects.get(key, ())
+        pairs = min(len(old_objs), len(new_objs))
+        for o, n in zip(old_objs[:pairs], new_objs[:pairs]):
+            if o == n:
+                continue
+            changed, removed = field_delta(o, n)
+            moved = any(k in changed for k in POSITION_FIELDS)
+            entry = {"object": dict(o), "set": changed, "unset": removed}
+            if moved:
+                entry["from"] = position(o)
+                entry["to"] = position(n)
+            result["moved" if moved else "changed"].append(entry)
+        unmatched_old.extend(old_objs[pairs:])
+        unmatched_new.extend(new_objs[pairs:])
+    for key, new_objs in new.objects.items():
+        if key not in old.objects:
+            unmatched_new.extend(new_objs)
+
+    # Pass 2: join leftovers on everything but position
+    waiting: Dict[MapObject, deque] = defaultdict(deque)
+    for o in unmatched_old:
+        waiting[object_signature(o)].append(o)
+    for n in unmatched_new:
+        candidates = waiting.get(object_signature(n))
+        if candidates:
+            o = candidates.popleft()
+            changed, removed = field_delta(o, n)
+            result["moved"].append({"object": dict(o), "set": changed, "unset": removed,
+                                    "from": position(o), "to": position(n)})
+        else:
+            result["added"].append({"object": dict(n)})
+    for candidates in waiting.values():
+        result["removed"].extend({"object": dict(o)} for o in candidates)
+
+    return result
+
+
+def diff_maps(old_path, new_path) -> Dict:
+    """Structural diff of two .fomap files"""
+    old = MapSide(old_path)
+    new = MapSide(new_path)
+    header = {k: v for k, v in new.header.items() if old.header.get(k) != v}
+    header_removed = [k for k in old.header if k not in new.header]
+    return {
+        "format": PATCH_FORMAT,
+        "version": PATCH_VERSION,
+        "header": header,
+        "header_removed": header_removed,
+        "tiles": diff_tiles(old, new),
+        "objects": diff_objects(old, new),
+    }
+
+
+def apply_patch(data: FomapData, patch: Dict) -> FomapData:
+    """Apply a diff produced by diff_maps to the old map"""
+    if patch.get("format") != PATCH_FORMAT or patch.get("version") != PATCH_VERSION:
+        raise ValueError("Not a fomap patch of a supported version")
+
+    data.header.update(patch.get("header", {}))
+    for key in patch.get("header_removed", []):
+        data.header.pop(key, None)
+
+    # Tiles: drop every tile of a touched key, then re-add the new paths
+    tiles = patch["tiles"]
+    replaced = {(hx, hy, layer): paths for hx, hy, layer, paths in tiles["added"]}
+    replaced.update({(hx, hy, layer): paths for hx, hy, layer, _, paths in tiles["changed"]})
+    dropped = {(hx, hy, layer) for hx, hy, layer, _ in tiles["removed"]} | set(replaced)
+    data.tiles = [t for t in data.tiles if (t.hx, t.hy, t.layer) not in dropped]
+    for (hx, hy, layer), paths in replaced.items():
+        data.tiles.extend(Tile(layer, hx, hy, p) for p in paths)
+
+    # Objects: locate each patched object by its full original field list
+    slots: Dict[MapObject, deque] = defaultdict(deque)
+    for i, obj in enumerate(data.objects):
+        slots[obj].append(i)
+
+    def locate(entry) -> int:
+        obj = tuple(entry["object"].items())
+        if not slots.get(obj):
+            raise ValueError(f"Patch does not apply: object not found: {entry['object']}")
+        return slots[obj].popleft()
+
+    objects: List = list(data.objects)
+    ops = patch["objects"]
+    for entry in ops["removed"]:
+        objects[locate(entry)] = None
+    for entry in ops["moved"] + ops["changed"]:
+        i = locate(entry)
+        fields = dict(objects[i])
+        fields.update(entry["set"])
+        for name in entry["unset"]:
+            fields.pop(name, None)
+        objects[i] = tuple(fields.items())
+    objects.extend(tuple(entry["object"].items()) for entry in ops["added"])
+    data.objects = [obj for obj in objects if obj is not None]
+    return data
+
+
+def print_summary(diff: Dict):
+    """Print a reviewer-friendly summary of a diff"""
+    tiles = diff["tiles"]
+    objects = diff["objects"]
+
+    if diff["header"] or diff["header_removed"]:
+        print("Header:")
+        for k, v in diff["header"].items():
+            print(f"  ~ {k} = {v}")
+        for k in diff["header_removed"]:
+            print(f"  - {k}")
+
+    print(f"Tiles: +{len(tiles['added'])} -{len(tiles['removed'])} ~{len(tiles['changed'])}")
+    for hx, hy, layer, paths in tiles["added"][:20]:
+        print(f"  + {layer} ({hx},{hy}) {', '.join(paths)}")
+    for hx, hy, layer, paths in tiles["removed"][:20]:
+        print(f"  - {layer} ({hx},{hy}) {', '.join(paths)}")
+    for hx, hy, layer, old, new in tiles["changed"][:20]:
+        print(f"  ~ {layer} ({hx},{hy}) {', '.join(old)} -> {', '.join(new)}")
+
+    print(f"Objects: +{len(objects['added'])} -{len(objects['removed'])} "
+          f">{len(objects['moved'])} ~{len(objects['changed'])}")
+
+    def describe(obj):
+        return f"type {obj.get('MapObjType')} proto {obj.get('ProtoId')} at ({obj.get('MapX')},{obj.get('MapY')})"
+
+    for entry in objects["added"][:20]:
+        print(f"  + {describe(entry['object'])}")
+    for entry in objects["removed"][:20]:
+        print(f"  - {describe(entry['object'])}")
+    for entry in objects["moved"][:20]:
+        print(f"  > {describe(entry['object'])} -> ({entry['to'][0]},{entry['to'][1]})")
+    for entry in objects["changed"][:20]:
+        print(f"  ~ {describe(entry['object'])} set {entry['set']} unset {entry['unset']}")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    if len(sys.argv) > 1 and sys.argv[1] == "apply":
+        parser = argparse.ArgumentParser(description="Apply a fomap JSON patch")
+        parser.add_argument("command")
+        parser.add_argument("old", help="Map the patch was made against")
+        parser.add_argument("patch", help="JSON patch from map_diff.py --patch")
+        parser.add_argument("out", help="Output .fomap path")
+        args = parser.parse_args()
+
+        with open(args.patch, "r", encoding="utf-8") as f:
+            patch = json.load(f)
+        try:
+            data = apply_patch(read_fomap(args.old), patch)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        write_fomap(data, args.out)
+        print(f"✅ Patched map written to {args.out}")
+        return
+
+    parser = argparse.ArgumentParser(description="Structural diff of two .fomap files")
+    parser.add_argument("old", help="Old .fomap")
+    parser.add_argument("new", help="New .fomap")
+    parser.add_argument("--patch", help="Write an applicable JSON patch to this path")
+    parser.add_argument("--json", action="store_true", help="Print the diff as JSON")
+    args = parser.parse_args()
+
+    diff = diff_maps(args.old, args.new)
+
+    if args.patch:
+        with open(args.patch, "w", encoding="utf-8") as f:
+            json.dump(diff, f)
+        print(f"📄 Patch saved to {args.patch}")
+
+    if args.json:
+        json.dump(diff, sys.stdout, indent=2)
+        print()
+    else:
+        print_summary(diff)
+
+    tiles, objects = diff["tiles"], diff["objects"]
+    changed = diff["header"] or diff["header_removed"] or any(tiles.values()) or any(objects.values())
+    sys.exit(1 if changed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+FOnline Map Reachability Analyzer
+Finds interactive objects and exit grids that cannot be walked to from the
+map entrances because blocking scenery walls them off.
+
+The entrances are the map's entire objects (grid protos the server spawns
+arriving players on). Maps without any fall back to the --entrance hexes,
+or to WorkHexX/WorkHexY, which is only where the mapper's view was left.
+
+The map is rasterized into a packed bitset of MaxHexX * MaxHexY bits (bit
+y * MaxHexX + x), with a hex blocked when an object on it has a proto with
+collision set. The flood fill works on whole bitsets: each step runs the
+frontier along its passable row and column segments, then grows it by one
+ring with shifts that follow hexNeighbors() in src/engine/hexMath.js (odd
+rows are shifted right):
+
+    odd row y:  E (x+1, y)  NE (x+1, y-1)  NW (x, y-1)    W (x-1, y)  SW (x, y+1)    SE (x+1, y+1)
+    even row y: E (x+1, y)  NE (x, y-1)    NW (x-1, y-1)  W (x-1, y)  SW (x-1, y+1)  SE (x, y+1)
+
+Objects count as reachable when their own hex or a neighbouring one is
+reached, since containers, doors and grids are used from the next hex.
+
+Usage:
+    python scripts/map_reachability.py [maps...] [--db data/protos.db]
+                                       [--entrance HX,HY ...] [--jobs N] [--report reach.json]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from aop_config import DEFAULT_CONFIG, load_config, server_path
+from fomap_parser import collect_sources, iter_fomap, obj_int
+
+# protos.type of exit grids and entires
+PROTO_TYPE_GRID = 5
+
+# SP_GRID_ENTIRE in the SDK's ITEMPID.H; grid protos named like these words count too
+ENTIRE_PIDS = frozenset({3853})
+ENTIRE_NAME_WORDS = ("entire", "entrance")
+
+
+class ProtoFlags(NamedTuple):
+    blocking: FrozenSet[int]
+    interactive: FrozenSet[int]
+    grids: FrozenSet[int]
+    entires: FrozenSet[int] = ENTIRE_PIDS
+
+
+def is_entire_name(name: str) -> bool:
+    lowered = (name or "").lower()
+    return any(word in lowered for word in ENTIRE_NAME_WORDS)
+
+
+def load_proto_flags(db_path: str) -> ProtoFlags:
+    """Blocking, interactive, exit grid and entire PIDs from protos.db"""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("SELECT proto_id, type, collision, interactive, name FROM protos").fetchall()
+    finally:
+        conn.close()
+    entires = ENTIRE_PIDS | {pid for pid, proto_type, _, _, name in rows
+                             if proto_type == PROTO_TYPE_GRID and is_entire_name(name)}
+    return ProtoFlags(
+        blocking=frozenset(pid for pid, _, collision, _, _ in rows if collision),
+        interactive=frozenset(pid for pid, _, _, interactive, _ in rows if interactive),
+        grids=frozenset(pid for pid, proto_type, _, _, _ in rows
+                        if proto_type == PROTO_TYPE_GRID and pid not in entires),
+        entires=frozenset(entires),
+    )
+
+
+def pack_bits(mask: np.ndarray) -> int:
+    """Pack a flat bool array into an int with bit i = mask[i]"""
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+
+class HexGrid:
+    """Bitset helpers for one MaxHexX x MaxHexY grid"""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        xs = np.tile(np.arange(width), height)
+        ys = np.repeat(np.arange(height), width)
+        self.full = (1 << (width * height)) - 1
+        self.not_first_col = pack_bits(xs > 0)
+        self.not_last_col = pack_bits(xs < width - 1)
+        odd = (ys & 1).astype(bool)
+        self.odd_shift_right = pack_bits(odd & (xs < width - 1))  # odd rows stepping to x+1
+        self.even_shift_left = pack_bits(~odd & (xs > 0))  # even rows stepping to x-1
+
+    def bit(self, hx: int, hy: int) -> int:
+        return 1 << (hy * self.width + hx)
+
+    def contains(self, hx: int, hy: int) -> bool:
+        return 0 <= hx < self.width and 0 <= hy < self.height
+
+    def raster(self, hexes: List[Tuple[int, int]]) -> int:
+        """Bitset of every in-bounds hex in the list"""
+        if not hexes:
+            return 0
+        coords = np.array(hexes, dtype=np.int64)
+        xs, ys = coords[:, 0], coords[:, 1]
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        mask = np.zeros(self.width * self.height, dtype=bool)
+        mask[ys[inside] * self.width + xs[inside]] = True
+        return pack_bits(mask)
+
+    def neighbours(self, cells: int) -> int:
+        """Every hex adjacent to a hex in cells, clipped to the grid"""
+        w = self.width
+        result = ((cells & self.not_last_col) << 1) | ((cells & self.not_first_col) >> 1)
+        # Straight up/down is NW/SW on odd rows and NE/SE on even rows
+        result |= (cells >> w) | (cells << w)
+        right = cells & self.odd_shift_right
+        result |= (right >> (w - 1)) | (right << (w + 1))
+        left = cells & self.even_shift_left
+        result |= (left >> (w + 1)) | (left << (w - 1))
+        return result & self.full
+
+    def flood(self, seeds: int, passable: int) -> int:
+        """All hexes reachable from seeds through passable hexes
+
+        Every step also runs the new frontier to the ends of its passable row
+        and column segments, so a step costs about a hundred bitset operations
+        and the number of steps follows the turns along a path instead of its
+        length.
+        """
+        w = self.width
+        # East: adding the frontier to the passable bits carries through each run.
+        # The last column is cleared so the carry stops at the row end.
+        east = passable & self.not_last_col
+        # West, north and south: occluded fills where each level doubles the
+        # distance covered, over hexes whose next 2**k steps are all passable
+        west = self._fill_levels(passable & self.not_last_col, 1, w, lambda m, s: m >> s)
+        north = self._fill_levels(passable, w, w * self.height, lambda m, s: m >> s)
+        south = self._fill_levels(passable, w, w * self.height, lambda m, s: m << s)
+
+        reached = seeds
+        frontier = seeds
+        while frontier:
+            run = frontier | ((east + (frontier & east)) ^ east) & passable
+            for shift, step in west:
+                run |= step & (run >> shift)
+            up = down = run
+            for shift, step in north:
+                up |= step & (up >> shift)
+            for shift, step in south:
+                down |= step & (down << shift)
+            run |= up | down
+            reached |= run
+            frontier = self.neighbours(run) & passable & ~reached
+            reached |= frontier
+        return reached
+
+    @staticmethod
+    def _fill_levels(step: int, shift: int, limit: int, move) -> List[Tuple[int, int]]:
+        """(shift, mask) pairs for an occluded fill in one direction"""
+        levels = []
+        while shift < limit:
+            levels.append((shift, step))
+            step &= move(step, shift)
+            shift <<= 1
+        return levels
+
+
+@lru_cache(maxsize=8)
+def hex_grid(width: int, height: int) -> HexGrid:
+    return HexGrid(width, height)
+
+
+def analyze_map(path, flags: ProtoFlags, entrances: Optional[List[Tuple[int, int]]] = None) -> Dict:
+    """Reachability report of one map
+
+    Seeds are the map's entire objects; entrances (else WorkHexX/WorkHexY)
+    are only used when the map has none.
+    """
+    header = {}
+    blocking = []
+    targets = []
+    entires = []
+    for kind, item in iter_fomap(path):
+        if kind == "header":
+            header[item[0]] = item[1]
+        elif kind == "object":
+            pid = obj_int(item, "ProtoId", -1)
+            hx, hy = obj_int(item, "MapX"), obj_int(item, "MapY")
+            if pid in flags.blocking:
+                blocking.append((hx, hy))
+            if pid in flags.entires:
+                entires.append((hx, hy))
+            elif pid in flags.grids:
+                targets.append(("grid", pid, hx, hy))
+            elif pid in flags.interactive:
+                targets.append(("interactive", pid, hx, hy))
+
+    width = int(header.get("MaxHexX", 400))
+    height = int(header.get("MaxHexY", 400))
+    grid = hex_grid(width, height)
+
+    if entires:
+        seeds_hexes, seeded_from = entires, "entire"
+    elif entrances:
+        seeds_hexes, seeded_from = list(entrances), "entrance"
+    elif "WorkHexX" in header and "WorkHexY" in header:
+        seeds_hexes, seeded_from = [(int(header["WorkHexX"]), int(header["WorkHexY"]))], "workhex"
+    else:
+        seeds_hexes, seeded_from = [], "none"
+    seeds = grid.raster([h for h in seeds_hexes if grid.contains(*h)])
+
+    blocked = grid.raster(blocking)
+    reached = grid.flood(seeds, grid.full & ~blocked)
+    usable = reached | grid.neighbours(reached)
+
+    unreachable = [
+        {"kind": kind, "pid": pid, "x": hx, "y": hy}
+        for kind, pid, hx, hy in targets
+        if not grid.contains(hx, hy) or not usable & grid.bit(hx, hy)
+    ]
+    return {
+        "size": [width, height],
+        "entrances": seeds_hexes,
+        "seeded_from": seeded_from,
+        "blocked": blocked.bit_count(),
+        "reachable": reached.bit_count(),
+        "targets": len(targets),
+        "unreachable": unreachable,
+    }
+
+
+def _analyze_job(args):
+    path, flags, entrances = args
+    try:
+        return path, analyze_map(path, flags, entrances), None
+    except (OSError, ValueError) as e:
+        return path, None, str(e)
+
+
+def analyze_corpus(sources: List[Path], flags: ProtoFlags, entrances: Optional[List[Tuple[int, int]]] = None,
+                   jobs: Optional[int] = None) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+    """Analyze every map in parallel; returns (reports, errors) keyed by map name"""
+    todo = [(str(p), flags, entrances) for p in sources]
+    workers = min(jobs or os.cpu_count() or 1, len(todo)) or 1
+    reports = {}
+    errors = {}
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as pool:
+        if pool is None:
+            results = map(_analyze_job, todo)
+        else:
+            results = pool.map(_analyze_job, todo)
+        for path, report, error in results:
+            if error:
+                errors[Path(path).stem] = error
+            else:
+                reports[Path(path).stem] = report
+    return reports, errors
+
+
+def parse_hex(value: str) -> Tuple[int, int]:
+    hx, hy = value.split(",")
+    return int(hx), int(hy)
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Report walled-off interactive objects and exit grids")
+    parser.add_argument("maps", nargs="*", help="Map files or directories (default: <server>/maps)")
+    parser.add_argument("--db", default="data/protos.db", help="Path to protos.db")
+    parser.add_argument("--entrance", action="append", type=parse_hex, default=[],
+                        help="Entrance hex HX,HY for maps without entire objects (default: WorkHexX/WorkHexY)")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--limit", type=int, default=20, help="Unreachable objects printed per map")
+    parser.add_argument("--report", help="Write the full report as JSON")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="Path to aop-nightmare.cfg")
+
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"❌ Database not found: {args.db}")
+        sys.exit(1)
+
+    inputs = args.maps or [str(server_path(load_config(args.config)) / "maps")]
+    sources = collect_sources(inputs)
+    if not sources:
+        print("❌ No .fomap files found")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    flags = load_proto_flags(args.db)
+    reports, errors = analyze_corpus(sources, flags, args.entrance, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    for name, report in reports.items():
+        unreachable = report["unreachable"]
+        width, height = report["size"]
+        status = "❌" if unreachable else "✅"
+        print(f"{status} {name} ({width}x{height}): {report['reachable']} hexes reachable "
+              f"from {len(report['entrances'])} {report['seeded_from']} hexes, "
+              f"{len(unreachable)}/{report['targets']} targets unreachable")
+        for entry in unreachable[:args.limit]:
+            print(f"    {entry['kind']} PID {entry['pid']} at ({entry['x']},{entry['y']})")
+        if len(unreachable) > args.limit:
+            print(f"    ... (+{len(unreachable) - args.limit})")
+    for name, error in errors.items():
+        print(f"❌ {name}: {error}")
+
+    print(f"\n🔍 Analyzed {len(reports)} maps in {elapsed:.2f}s")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"maps": reports, "errors": errors}, f, indent=2)
+        print(f"📄 Report saved to {args.report}")
+
+    sys.exit(1 if errors or any(r["unreachable"] for r in reports.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+FOnline MSG reader
+Reads text/<lang>/*.MSG files ({key}{}{text} entries) into key -> text dicts.
+
+Entries are scanned as brace groups rather than lines, like the engine does:
+a text may run over several lines and ends at its first closing brace, and
+whatever follows it on the line (e.g. "# Normal") is ignored.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict
+
+# {key}{macro}{text} entry, or a # comment outside any entry. Groups end at
+# their first closing brace and may span lines; the text group must start on
+# the macro group's line, otherwise the entry was written as {key}{text}.
+MSG_ENTRY_RE = re.compile(r"\{(\d+)\}[ \t]*\{([^}]*)\}(?:[ \t]*\{([^}]*)\})?|#[^\n]*")
+
+
+def parse_msg(content: str) -> Dict[int, str]:
+    """Parse MSG text into {key: text}; later duplicates win like the engine"""
+    strings = {}
+    for m in MSG_ENTRY_RE.finditer(content):
+        if m.lastindex:
+            text = m.group(3)
+            strings[int(m.group(1))] = m.group(2) if text is None else text
+    return strings
+
+
+def read_msg(path, encoding: str = "utf-8") -> Dict[int, str]:
+    """Read a MSG file into {key: text}"""
+    with open(path, "r", encoding=encoding, errors="replace") as f:
+        return parse_msg(f.read())
+
+
+def proto_texts(msg: Dict[int, str]) -> Dict[int, str]:
+    """Collapse FOOBJ.MSG into {pid: "name description"} (keys pid*100 and pid*100+1)"""
+    texts = {}
+    for key, text in msg.items():
+        pid, slot = divmod(key, 100)
+        if slot > 1 or not text:
+            continue
+        texts[pid] = f"{texts[pid]} {text}" if pid in texts else text
+    return texts
+
+
+def msg_files(text_dir) -> Dict[str, Path]:
+    """Map upper-cased MSG file name -> path for one language directory"""
+    return {p.name.upper(): p for p in Path(text_dir).iterdir() if p.suffix.upper() == ".MSG"}
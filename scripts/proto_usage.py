@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+FOnline Proto Usage Index
+Answers "which maps place this PID, how often and where?" without grepping
+every .fomap file.
+
+The index lives in protos.db next to the protos table:
+
+    usage_maps    one row per indexed map with its size and mtime
+    proto_usage   (proto_id, map_id) -> placement count and packed positions
+                  (little-endian u16 MapX, MapY pairs)
+
+Building is a map-reduce: every changed map is scanned in its own worker
+process, and the main process replaces that map's rows in one transaction.
+Maps whose size and mtime are unchanged are skipped, so re-running after
+editing one map only rescans that map.
+
+Usage:
+    python scripts/proto_usage.py build [maps...] [--jobs N] [--force]
+    python scripts/proto_usage.py update <map.fomap>
+    python scripts/proto_usage.py where <pid> [--positions]
+    python scripts/proto_usage.py unused [--type N]
+    python scripts/proto_usage.py top [--limit 10] [--pid N]
+"""
+
+import os
+import sqlite3
+import sys
+import time
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from aop_config import DEFAULT_CONFIG, load_config, server_path
+from fomap_parser import collect_sources, iter_fomap, obj_int
+
+DEFAULT_DB = "data/protos.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_maps (
+    map_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    objects INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS proto_usage (
+    proto_id INTEGER NOT NULL,
+    map_id INTEGER NOT NULL REFERENCES usage_maps(map_id) ON DELETE CASCADE,
+    count INTEGER NOT NULL,
+    positions BLOB NOT NULL,
+    PRIMARY KEY (proto_id, map_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_proto_usage_map ON proto_usage(map_id);
+"""
+
+MapUsage = Dict[int, Tuple[int, bytes]]
+
+
+def pack_positions(coords: array) -> bytes:
+    if sys.byteorder != "little":
+        coords = array("H", coords)
+        coords.byteswap()
+    return coords.tobytes()
+
+
+def unpack_positions(blob: bytes) -> List[Tuple[int, int]]:
+    """Decode a positions blob into (MapX, MapY) pairs"""
+    coords = array("H")
+    coords.frombytes(blob)
+    if sys.byteorder != "little":
+        coords.byteswap()
+    return list(zip(coords[0::2], coords[1::2]))
+
+
+def scan_map(path) -> Tuple[int, MapUsage]:
+    """Object count and {pid: (count, packed positions)} of one map"""
+    positions: Dict[int, array] = defaultdict(lambda: array("H"))
+    objects = 0
+    for kind, obj in iter_fomap(path):
+        if kind != "object":
+            continue
+        objects += 1
+        pid = obj_int(obj, "ProtoId", -1)
+        if pid < 0:
+            continue
+        coords = positions[pid]
+        coords.append(obj_int(obj, "MapX") & 0xFFFF)
+        coords.append(obj_int(obj, "MapY") & 0xFFFF)
+    return objects, {pid: (len(coords) // 2, pack_positions(coords)) for pid, coords in positions.items()}
+
+
+def _scan_job(path: str):
+    try:
+        return path, scan_map(path), None
+    except (OSError, ValueError) as e:
+        return path, None, str(e)
+
+
+def connect(db_path: str = DEFAULT_DB) -> sqlite3.Connection:
+    """Open protos.db and create the usage tables if needed"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def store_map(conn: sqlite3.Connection, path: Path, objects: int, usage: MapUsage):
+    """Replace one map's rows in the index"""
+    st = path.stat()
+    with conn:
+        row = conn.execute("SELECT map_id FROM usage_maps WHERE name = ?", (path.stem,)).fetchone()
+        if row:
+            map_id = row[0]
+            conn.execute("DELETE FROM proto_usage WHERE map_id = ?", (map_id,))
+            conn.execute("UPDATE usage_maps SET path = ?, size = ?, mtime_ns = ?, objects = ? WHERE map_id = ?",
+                         (str(path), st.st_size, st.st_mtime_ns, objects, map_id))
+        else:
+            map_id = conn.execute(
+                "INSERT INTO usage_maps (name, path, size, mtime_ns, objects) VALUES (?, ?, ?, ?, ?)",
+                (path.stem, str(path), st.st_size, st.st_mtime_ns, objects),
+            ).lastrowid
+        conn.executemany(
+            "INSERT INTO proto_usage (proto_id, map_id, count, positions) VALUES (?, ?, ?, ?)",
+            ((pid, map_id, count, blob) for pid, (count, blob) in usage.items()),
+        )
+
+
+def is_current(conn: sqlite3.Connection, path: Path) -> bool:
+    """True when the indexed copy of a map matches its size and mtime"""
+    row = conn.execute("SELECT size, mtime_ns FROM usage_maps WHERE name = ?", (path.stem,)).fetchone()
+    if row is None:
+        return False
+    st = path.stat()
+    return row == (st.st_size, st.st_mtime_ns)
+
+
+def build_index(conn: sqlite3.Connection, sources: List[Path], jobs: Optional[int] = None,
+                force: bool = False, prune: bool = True) -> Dict:
+    """Scan every changed map in parallel and merge the results into the index"""
+    todo = [str(p) for p in sources if force or not is_current(conn, p)]
+
+    errors = {}
+    scanned = 0
+    if todo:
+        workers = min(jobs or os.cpu_count() or 1, len(todo))
+        with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as pool:
+            if pool is None:
+                results = map(_scan_job, todo)
+            else:
+                results = pool.map(_scan_job, todo)
+            for path, result, error in results:
+                if error:
+                    errors[Path(path).stem] = error
+                    continue
+                store_map(conn, Path(path), *result)
+                scanned += 1
+
+    removed = 0
+    if prune:
+        names = {p.stem for p in sources}
+        stale = [(map_id,) for map_id, name in conn.execute("SELECT map_id, name FROM usage_maps")
+                 if name not in names]
+        with conn:
+            conn.executemany("DELETE FROM usage_maps WHERE map_id = ?", stale)
+        removed = len(stale)
+
+    return {"total": len(sources), "scanned": scanned, "skipped": len(sources) - len(todo),
+            "removed": removed, "errors": errors}
+
+
+def update_map(conn: sqlite3.Connection, path: Path) -> int:
+    """Re-index a single map; returns the number of distinct protos it places"""
+    objects, usage = scan_map(path)
+    store_map(conn, path, objects, usage)
+    return len(usage)
+
+
+def proto_usage(conn: sqlite3.Connection, pid: int) -> List[Tuple[str, int, bytes]]:
+    """(map, count, positions blob) for every map placing a proto, most placements first"""
+    return conn.execute(
+        "SELECT m.name, u.count, u.positions FROM proto_usage u JOIN usage_maps m USING (map_id) "
+        "WHERE u.proto_id = ? ORDER BY u.count DESC, m.name",
+        (pid,),
+    ).fetchall()
+
+
+def usage_counts(conn: sqlite3.Connection) -> Dict[int, Tuple[int, int]]:
+    """{pid: (total placements, number of maps)} for every placed proto"""
+    return {pid: (total, maps) for pid, total, maps in conn.execute(
+        "SELECT proto_id, SUM(count), COUNT(*) FROM proto_usage GROUP BY proto_id")}
+
+
+def unused_protos(conn: sqlite3.Connection, proto_type: Optional[int] = None) -> List[Tuple[int, str]]:
+    """(pid, name) of protos in the protos table that no indexed map places"""
+    sql = ("SELECT p.proto_id, p.name FROM protos p WHERE NOT EXISTS "
+           "(SELECT 1 FROM proto_usage u WHERE u.proto_id = p.proto_id)")
+    params: tuple = ()
+    if proto_type is not None:
+        sql += " AND p.type = ?"
+        params = (proto_type,)
+    return conn.execute(sql + " ORDER BY p.proto_id", params).fetchall()
+
+
+def heaviest_maps(conn: sqlite3.Connection, limit: int = 10,
+                  pid: Optional[int] = None) -> List[Tuple[str, int]]:
+    """Maps with the most objects, or with the most placements of one proto"""
+    if pid is None:
+        return conn.execute("SELECT name, objects FROM usage_maps ORDER BY objects DESC, name LIMIT ?",
+                            (limit,)).fetchall()
+    return [(name, count) for name, count, _ in proto_usage(conn, pid)[:limit]]
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Proto usage index over all .fomap files")
+    parser.add_argument("--db", default=DEFAULT_DB, help="Path to protos.db")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Index every changed map")
+    build.add_argument("maps", nargs="*", help="Map files or directories (default: <server>/maps)")
+    build.add_argument("--jobs", "-j", type=int, help="Worker processes (default: all cores)")
+    build.add_argument("--force", action="store_true", help="Rescan unchanged maps")
+    build.add_argument("--config", default=DEFAULT_CONFIG, help="Path to aop-nightmare.cfg")
+
+    update = sub.add_parser("update", help="Re-index a single map")
+    update.add_argument("map", help="Changed .fomap file")
+
+    where = sub.add_parser("where", help="Maps placing a proto")
+    where.add_argument("pid", type=int)
+    where.add_argument("--positions", action="store_true", help="List every placement")
+
+    unused = sub.add_parser("unused", help="Protos placed on no map")
+    unused.add_argument("--type", type=int, help="Only protos of this type")
+
+    top = sub.add_parser("top", help="Heaviest maps")
+    top.add_argument("--limit", type=int, default=10)
+    top.add_argument("--pid", type=int, help="Rank by placements of this proto instead of object count")
+
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"❌ Database not found: {args.db}")
+        sys.exit(1)
+
+    conn = connect(args.db)
+    try:
+        if args.command == "build":
+            inputs = args.maps or [str(server_path(load_config(args.config)) / "maps")]
+            sources = collect_sources(inputs)
+            if not sources:
+                print("❌ No .fomap files found")
+                sys.exit(1)
+            start = time.perf_counter()
+            # Explicit map lists are partial updates; only a full corpus run prunes deleted maps
+            result = build_index(conn, sources, args.jobs, args.force, prune=not args.maps)
+            elapsed = time.perf_counter() - start
+            print(f"✅ Indexed {result['scanned']} maps, skipped {result['skipped']} unchanged, "
+                  f"removed {result['removed']} ({result['total']} total) in {elapsed:.2f}s")
+            for name, error in result["errors"].items():
+                print(f"  ❌ {name}: {error}")
+            sys.exit(1 if result["errors"] else 0)
+
+        elif args.command == "update":
+            if not Path(args.map).exists():
+                print(f"❌ Map not found: {args.map}")
+                sys.exit(1)
+            count = update_map(conn, Path(args.map))
+            print(f"✅ Re-indexed {Path(args.map).stem}: {count} distinct protos")
+
+        elif args.command == "where":
+            rows = proto_usage(conn, args.pid)
+            if not rows:
+                print(f"PID {args.pid} is not placed on any indexed map")
+                return
+            total = sum(count for _, count, _ in rows)
+            print(f"PID {args.pid}: {total} placements on {len(rows)} maps")
+            for name, count, blob in rows:
+                print(f"  {name}: {count}")
+                if args.positions:
+                    print("    " + " ".join(f"({x},{y})" for x, y in unpack_positions(blob)))
+
+        elif args.command == "unused":
+            rows = unused_protos(conn, args.type)
+            for pid, name in rows:
+                print(f"  {pid}: {name}")
+            print(f"{len(rows)} protos are not placed on any indexed map")
+
+        elif args.command == "top":
+            rows = heaviest_maps(conn, args.limit, args.pid)
+            label = f"placements of PID {args.pid}" if args.pid is not None else "objects"
+            for name, count in rows:
+                print(f"  {name}: {count} {label}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
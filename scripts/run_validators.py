@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+FOnline Validation Suite Runner
+Runs any combination of validate_index.py, validate_indexation.py and
+verify-index.py against one shared IndexCache, so each source/database/*.json
+file is read and parsed at most once per run.
+
+Validator modules are imported only when selected, and --snapshot keeps the
+parsed indexes in a pickle between runs (invalidated per file by size/mtime).
+
+Usage:
+    python scripts/run_validators.py [--only index,indexation,verify]
+                                     [--server PATH] [--client PATH]
+                                     [--snapshot .cache/index-cache.pickle]
+"""
+
+import importlib
+import sys
+import time
+from typing import Callable, Dict
+
+from index_cache import DB_DIR, IndexCache
+
+VALIDATORS = ("index", "indexation", "verify")
+
+
+def run_index(cache: IndexCache, args) -> bool:
+    module = importlib.import_module("validate_index")
+    validator = module.IndexValidator(args.index, cache=cache)
+    return validator.run_validation(args.report)
+
+
+def run_indexation(cache: IndexCache, args) -> bool:
+    module = importlib.import_module("validate_indexation")
+    validator = module.IndexationValidator(args.config, cache=cache)
+    return validator.run_all()
+
+
+def run_verify(cache: IndexCache, args) -> bool:
+    if not args.server or not args.client:
+        print("⚠️ verify needs --server and --client, skipping")
+        return True
+    module = importlib.import_module("verify-index")
+    module.run_checks(args.server, args.client, cache)
+    return True
+
+
+RUNNERS: Dict[str, Callable[[IndexCache, object], bool]] = {
+    "index": run_index,
+    "indexation": run_indexation,
+    "verify": run_verify,
+}
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run FOnline index validators with a shared cache")
+    parser.add_argument("--only", default=",".join(VALIDATORS),
+                        help=f"Comma-separated validators to run ({', '.join(VALIDATORS)})")
+    parser.add_argument("--db-dir", default=str(DB_DIR), help="Generated JSON index directory")
+    parser.add_argument("--snapshot", help="Pickle snapshot of parsed indexes reused across runs")
+    parser.add_argument("--index", default="fonline-index.json", help="validate_index: index file")
+    parser.add_argument("--report", default="validation_report.txt", help="validate_index: report file")
+    parser.add_argument("--config", default="scripts/aop-nightmare.cfg", help="validate_indexation: cfg file")
+    parser.add_argument("--server", help="verify-index: server path")
+    parser.add_argument("--client", help="verify-index: client path")
+
+    args = parser.parse_args()
+
+    selected = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in RUNNERS]
+    if unknown:
+        print(f"❌ Unknown validators: {', '.join(unknown)}")
+        sys.exit(2)
+
+    cache = IndexCache(args.db_dir, snapshot=args.snapshot)
+    results = {}
+    timings = {}
+    for name in selected:
+        start = time.perf_counter()
+        results[name] = RUNNERS[name](cache, args)
+        timings[name] = time.perf_counter() - start
+
+    if cache.save_snapshot():
+        print(f"📄 Index snapshot saved to {args.snapshot}")
+
+    print("\n" + "=" * 60)
+    print("VALIDATION SUITE")
+    print("=" * 60)
+    for name in selected:
+        status = "✅" if results[name] else "❌"
+        print(f"  {status} {name}: {timings[name] * 1000:.1f} ms")
+    print(f"  Index files parsed: {cache.parsed}, restored from snapshot: {cache.restored}")
+
+    sys.exit(0 if all(results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,9 +12,12 @@ from pathlib import Path
 from typing import Dict, List, Set, Tuple
 from collections import defaultdict
 
+from index_cache import IndexCache
+
 class IndexValidator:
-    def __init__(self, index_file: str = "fonline-index.json"):
+    def __init__(self, index_file: str = "fonline-index.json", cache: IndexCache = None):
         self.index_file = Path(index_file)
+        self.cache = cache or IndexCache()
         self.index = {}
         self.issues = {
             "missing_creatures": [],
@@ -31,13 +34,13 @@ class IndexValidator:
     def load_index(self) -> bool:
         """Load the index file"""
         try:
-            with open(self.index_file, 'r', encoding='utf-8') as f:
-                self.index = json.load(f)
+            index = self.cache.load(self.index_file)
+            if index is None:
+                print(f"❌ Index file not found: {self.index_file}")
+                return False
+            self.index = index
             print(f"✅ Loaded index from {self.index_file}")
             return True
-        except FileNotFoundError:
-            print(f"❌ Index file not found: {self.index_file}")
-            return False
         except json.JSONDecodeError as e:
             print(f"❌ Invalid JSON in index file: {e}")
             return False
@@ -274,7 +277,7 @@ class IndexValidator:
         
         print(f"📄 Report saved to {filename}")
     
-    def run_validation(self) -> bool:
+    def run_validation(self, report_file: str = "validation_report.txt") -> bool:
         """Run complete validation"""
         print("🚀 Starting FOnline index validation...")
         
@@ -290,7 +293,7 @@ class IndexValidator:
         self.check_orphaned_references()
         
         # Generate and save report
-        self.save_report()
+        self.save_report(report_file)
         
         # Print summary
         total_issues = sum(len(issues) for issues in self.issues.values())
@@ -313,7 +316,7 @@ def main():
     args = parser.parse_args()
     
     validator = IndexValidator(args.index)
-    success = validator.run_validation()
+    success = validator.run_validation(args.report)
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)
@@ -5,39 +5,26 @@ Checks for missing entries and validates parsing completeness
 """
 
 import os
-import json
 import glob
 import re
 from pathlib import Path
 from typing import Dict, List, Set, Tuple
 from datetime import datetime
 
+from aop_config import load_config
+from index_cache import IndexCache
+
 class IndexationValidator:
-    def __init__(self, config_path: str = "scripts/aop-nightmare.cfg"):
+    def __init__(self, config_path: str = "scripts/aop-nightmare.cfg", cache: IndexCache = None):
         self.config = self.load_config(config_path)
+        self.cache = cache or IndexCache()
         self.base_path = Path(self.config['paths']['server'])
         self.errors = []
         self.warnings = []
         
     def load_config(self, config_path: str) -> Dict:
         """Load configuration from CFG file"""
-        config = {}
-        current_section = None
-        
-        with open(config_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                    
-                if line.startswith('[') and line.endswith(']'):
-                    current_section = line[1:-1].lower()
-                    config[current_section] = {}
-                elif '=' in line and current_section:
-                    key, value = line.split('=', 1)
-                    config[current_section][key.strip()] = value.strip()
-                    
-        return config
+        return load_config(config_path)
     
     def check_file_exists(self, file_path: str) -> bool:
         """Check if file exists relative to base path"""
@@ -45,12 +32,9 @@ class IndexationValidator:
         return full_path.exists()
     
     def load_json_if_exists(self, file_path: str) -> Dict:
-        """Load JSON file if it exists"""
-        full_path = Path("source/database") / file_path
-        if full_path.exists():
-            with open(full_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+        """Load JSON file if it exists (parsed once per run via the shared cache)"""
+        data = self.cache.get(file_path)
+        return data if data is not None else {}
     
     def validate_creatures(self):
         """Validate creature indexing"""
@@ -219,6 +203,18 @@ class IndexationValidator:
             self.warnings.append(f"{undefined_count} script references not found in defines")
         
         print("  Cross-reference validation complete")
+    
+    def run_all(self) -> bool:
+        """Run every validation and print the report"""
+        self.validate_creatures()
+        self.validate_items()
+        self.validate_objects()
+        self.validate_critters_list()
+        self.validate_maps()
+        self.validate_defines()
+        self.check_cross_references()
+        
+        return self.generate_report()
         
     def generate_report(self):
         """Generate validation report"""
@@ -254,17 +250,8 @@ def main():
     print("Starting FOnline: Ashes of Phoenix indexation validation...")
     print(f"Base path: {validator.base_path}")
     
-    # Run all validations
-    validator.validate_creatures()
-    validator.validate_items()
-    validator.validate_objects()
-    validator.validate_critters_list()
-    validator.validate_maps()
-    validator.validate_defines()
-    validator.check_cross_references()
-    
-    # Generate report
-    success = validator.generate_report()
+    # Run all validations and generate report
+    success = validator.run_all()
     
     exit(0 if success else 1)
 
@@ -14,13 +14,12 @@ Checks:
     5. defines.json vs _defines.fos
 """
 
-import json
 import os
 import re
 import sys
 from pathlib import Path
 
-DB_DIR = Path("source/database")
+from index_cache import DB_DIR, IndexCache
 
 RED = "\033[91m"
 GREEN = "\033[92m"
@@ -28,21 +27,20 @@ YELLOW = "\033[93m"
 RESET = "\033[0m"
 
 
-def load_json(name):
-    p = DB_DIR / name
-    if not p.exists():
-        print(f"{RED}[MISSING]{RESET} {p} not found — run indexer first.")
-        return None
-    with open(p, "r", encoding="utf-8") as f:
-        return json.load(f)
+def load_json(name, cache=None):
+    cache = cache or IndexCache(DB_DIR)
+    data = cache.get(name)
+    if data is None:
+        print(f"{RED}[MISSING]{RESET} {cache.db_dir / name} not found — run indexer first.")
+    return data
 
 
-def check_tiles(client_path):
+def check_tiles(client_path, cache=None):
     print(f"\n{'='*50}")
     print("TILES CHECK")
     print(f"{'='*50}")
 
-    index = load_json("tiles.json")
+    index = load_json("tiles.json", cache)
     if not index:
         return
 
@@ -81,12 +79,12 @@ def check_tiles(client_path):
         print(f"  {GREEN}[OK]{RESET} No stale index entries.")
 
 
-def check_critters(server_path):
+def check_critters(server_path, cache=None):
     print(f"\n{'='*50}")
     print("CRITTERS CHECK")
     print(f"{'='*50}")
 
-    index = load_json("critters.json")
+    index = load_json("critters.json", cache)
     if not index:
         return
 
@@ -123,12 +121,12 @@ def check_critters(server_path):
         print(f"  {GREEN}[OK]{RESET} All entries have properties.")
 
 
-def check_items(server_path):
+def check_items(server_path, cache=None):
     print(f"\n{'='*50}")
     print("ITEMS CHECK")
     print(f"{'='*50}")
 
-    index = load_json("items.json")
+    index = load_json("items.json", cache)
     if not index:
         return
 
@@ -163,12 +161,12 @@ def check_items(server_path):
         print(f"  {GREEN}[OK]{RESET} All entries have properties.")
 
 
-def check_objects(server_path):
+def check_objects(server_path, cache=None):
     print(f"\n{'='*50}")
     print("OBJECTS (FOOBJ.MSG) CHECK")
     print(f"{'='*50}")
 
-    index = load_json("objects.json")
+    index = load_json("objects.json", cache)
     if not index:
         return
 
@@ -202,12 +200,12 @@ def check_objects(server_path):
         print(f"  {YELLOW}[INFO]{RESET} {len(no_name)} PIDs have no name string")
 
 
-def check_defines(server_path):
+def check_defines(server_path, cache=None):
     print(f"\n{'='*50}")
     print("DEFINES CHECK")
     print(f"{'='*50}")
 
-    index = load_json("defines.json")
+    index = load_json("defines.json", cache)
     if not index:
         return
 
@@ -237,6 +235,15 @@ def check_defines(server_path):
         print(f"  {GREEN}[OK]{RESET} All PID_ defines indexed.")
 
 
+def run_checks(server_path, client_path, cache=None):
+    cache = cache or IndexCache(DB_DIR)
+    check_tiles(client_path, cache)
+    check_critters(server_path, cache)
+    check_items(server_path, cache)
+    check_objects(server_path, cache)
+    check_defines(server_path, cache)
+
+
 def main():
     if len(sys.argv) < 3:
         print("Usage: python scripts/verify-index.py <serverPath> <clientPath>")
@@ -253,11 +260,7 @@ def main():
     print(f"Client: {client_path}")
     print(f"DB Dir: {DB_DIR}")
 
-    check_tiles(client_path)
-    check_critters(server_path)
-    check_items(server_path)
-    check_objects(server_path)
-    check_defines(server_path)
+    run_checks(server_path, client_path)
 
     print(f"\n{'='*50}")
     print(f"{GREEN}Verification complete.{RESET}")
@@ -0,0 +1,190 @@
+"""
+Performance suite for the Python tooling in scripts/
+
+Run from the repository root:
+
+    python -m pytest tests/perf                    # compare against baseline.json
+    python -m pytest tests/perf --perf-update      # re-record baseline.json
+    python -m pytest tests/perf --perf-margin 1.0  # allow 100% over baseline
+
+A baseline test fails when its best-of-N time or its tracemalloc peak exceeds
+the recorded value by more than the margin (--perf-margin, else PERF_MARGIN,
+else "margin" in baseline.json). Complexity tests need no baseline: they fail
+when run time grows faster than near-linearly over 1x, 4x and 16x input.
+"""
+
+import contextlib
+import functools
+import gc
+import io
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, TypeVar
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from synthetic import build_workspace, write_map  # noqa: E402  (needs scripts/ on sys.path)
+
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+DEFAULT_MARGIN = 1.0
+
+SCALES = (1, 4, 16)
+# Exponent k in time ~ n**k, fitted by least squares over log time vs log scale
+MAX_SCALING_EXPONENT = 1.3
+
+# Keep re-running calls shorter than this in total, up to MAX_RUNS times
+MIN_TIMED_SECONDS = 0.2
+MAX_RUNS = 50
+
+T = TypeVar("T")
+
+
+class Measurement(NamedTuple):
+    seconds: float
+    peak_kb: int
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf")
+    group.addoption("--perf-margin", type=float, default=None,
+                    help="Allowed fraction over the baseline (default: PERF_MARGIN or baseline.json)")
+    group.addoption("--perf-update", action="store_true", help="Record the measured values as the new baseline")
+    group.addoption("--perf-repeat", type=int, default=3, help="Timed runs per measurement (best is kept)")
+
+
+def quiet(fn: Callable, *args, **kwargs):
+    """Call fn with stdout swallowed; the validators print a lot"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def fit_exponent(times: Dict[int, float]) -> float:
+    """Slope of log(time) against log(scale), so no single noisy run decides it"""
+    xs = [math.log(scale) for scale in times]
+    ys = [math.log(seconds) for seconds in times.values()]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    return (sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+            / sum((x - mean_x) ** 2 for x in xs))
+
+
+class PerfRecorder:
+    scales = SCALES
+
+    def __init__(self, config):
+        self.update = config.getoption("--perf-update")
+        self.repeat = max(1, config.getoption("--perf-repeat"))
+        self.baseline = {"margin": DEFAULT_MARGIN, "tests": {}}
+        if BASELINE_FILE.exists():
+            with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+                self.baseline = json.load(f)
+        margin = config.getoption("--perf-margin")
+        if margin is None:
+            margin = float(os.environ.get("PERF_MARGIN", self.baseline.get("margin", DEFAULT_MARGIN)))
+        self.margin = margin
+        self.results: Dict[str, Measurement] = {}
+
+    def time(self, fn: Callable, *args) -> float:
+        """Best wall time of fn over the configured number of runs
+
+        Fast calls are repeated until MIN_TIMED_SECONDS have been spent on
+        them, since a single few-millisecond run is mostly noise.
+        """
+        best = math.inf
+        spent = 0.0
+        runs = 0
+        while runs < self.repeat or (spent < MIN_TIMED_SECONDS and runs < MAX_RUNS):
+            runs += 1
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                quiet(fn, *args)
+                elapsed = time.perf_counter() - start
+            finally:
+                gc.enable()
+            best = min(best, elapsed)
+            spent += elapsed
+        return best
+
+    def peak(self, fn: Callable, *args) -> int:
+        """Peak traced allocation of one run of fn, in KiB"""
+        gc.collect()
+        tracemalloc.start()
+        try:
+            quiet(fn, *args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak // 1024
+
+    def check(self, name: str, fn: Callable, *args) -> Measurement:
+        """Measure fn and compare it against the baseline entry called name"""
+        measured = Measurement(self.time(fn, *args), self.peak(fn, *args))
+        self.results[name] = measured
+        if self.update:
+            return measured
+
+        expected = self.baseline["tests"].get(name)
+        if expected is None:
+            pytest.skip(f"no baseline for {name}; record one with --perf-update")
+        limit = 1 + self.margin
+        assert measured.seconds <= expected["seconds"] * limit, (
+            f"{name}: {measured.seconds * 1000:.1f} ms exceeds baseline "
+            f"{expected['seconds'] * 1000:.1f} ms by more than {self.margin:.0%}")
+        assert measured.peak_kb <= expected["peak_kb"] * limit, (
+            f"{name}: peak {measured.peak_kb} KiB exceeds baseline "
+            f"{expected['peak_kb']} KiB by more than {self.margin:.0%}")
+        return measured
+
+    def assert_near_linear(self, name: str, run_at_scale: Callable[[int], None]):
+        """Fail when run time grows faster than n**MAX_SCALING_EXPONENT across SCALES"""
+        times = {scale: self.time(run_at_scale, scale) for scale in SCALES}
+        exponent = fit_exponent(times)
+        detail = ", ".join(f"{s}x {t * 1000:.1f} ms" for s, t in times.items())
+        assert exponent <= MAX_SCALING_EXPONENT, (
+            f"{name} scales as n^{exponent:.2f} (limit n^{MAX_SCALING_EXPONENT}): {detail}")
+
+    def save(self):
+        tests = dict(self.baseline.get("tests", {}))
+        tests.update({name: {"seconds": round(m.seconds, 5), "peak_kb": m.peak_kb}
+                      for name, m in self.results.items()})
+        data = {"margin": self.baseline.get("margin", DEFAULT_MARGIN), "tests": dict(sorted(tests.items()))}
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+
+
+@pytest.fixture(scope="session")
+def perf(request) -> PerfRecorder:
+    recorder = PerfRecorder(request.config)
+    yield recorder
+    if recorder.update and recorder.results:
+        recorder.save()
+
+
+def scaled(build: Callable[[int], T]) -> Callable[[int], T]:
+    """Memoize build(scale) so a session fixture builds each scale on first use only"""
+    return functools.lru_cache(maxsize=None)(build)
+
+
+@pytest.fixture(scope="session")
+def workspaces(tmp_path_factory):
+    """Synthetic server/client/index workspaces by scale, built on first use"""
+    return scaled(lambda scale: build_workspace(tmp_path_factory.mktemp(f"workspace{scale}x"), scale))
+
+
+@pytest.fixture(scope="session")
+def maps(tmp_path_factory):
+    """Synthetic (old, new) map pairs by scale, built on first use"""
+    root = tmp_path_factory.mktemp("maps")
+    return scaled(lambda scale: (write_map(root / f"old{scale}x.fomap", scale, seed=1),
+                                 write_map(root / f"new{scale}x.fomap", scale, seed=2)))
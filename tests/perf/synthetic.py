@@ -0,0 +1,232 @@
+"""
+Scaled synthetic data for the performance suite
+
+Every generator takes a scale factor and is deterministic, so the 1x/4x/16x
+inputs of a complexity test differ only in size.
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import NamedTuple
+
+from fomap_parser import FomapData, Tile, write_fomap
+
+ROOT = Path(__file__).resolve().parents[2]
+REAL_CONFIG = ROOT / "scripts" / "aop-nightmare.cfg"
+
+# Entities per 1x workspace / map, sized so every 1x run takes about 10 ms or more
+BASE_PROTOS = 3000
+BASE_TILE_FILES = 3000
+BASE_DEFINES = 10000
+BASE_INDEX_ENTRIES = 4000
+BASE_MAP_OBJECTS = 2500
+BASE_MAP_TILES = 2500
+BASE_MSG_KEYS = 10000
+BASE_MSG_FILES = 2
+BASE_TABLE_KEYS = 200000
+BASE_PROTO_TEXTS = 4000
+BASE_FLOOD_COLUMNS = 400
+
+LANGUAGES = ("engl", "russ", "germ")
+PROTO_WORDS = ("raider", "gecko", "rifle", "stimpak", "wall", "door", "crate", "ghoul", "robot", "brahmin",
+               "old", "rusty", "broken", "heavy", "small", "the", "a", "of", "with", "caps")
+
+
+class Workspace(NamedTuple):
+    root: Path
+    db_dir: Path
+    indexation_db_dir: Path
+    server: Path
+    client: Path
+    index_file: Path
+    config: Path
+    report: Path
+
+
+def _write_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def write_msg(path: Path, keys: int, seed: int = 0) -> Path:
+    """FOOBJ.MSG-style file with name/description pairs for keys // 2 PIDs"""
+    rng = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for pid in range(keys // 2):
+            f.write(f"{{{pid * 100}}}{{}}{{Object {pid}}}\n")
+            text = "You see %d caps." if rng.random() < 0.1 else f"A plain description of object {pid}."
+            f.write(f"{{{pid * 100 + 1}}}{{}}{{{text}}}\n")
+    return path
+
+
+def build_text_dir(root: Path, scale: int) -> Path:
+    """text/<lang>/ tree with BASE_MSG_FILES files of scale * BASE_MSG_KEYS / 4 keys per language
+
+    Translations lose a few keys and get their placeholders from another
+    seed, so the checker has missing keys and mismatches to report.
+    """
+    text_dir = root / "text"
+    for i, lang in enumerate(LANGUAGES):
+        for n in range(BASE_MSG_FILES):
+            keys = scale * BASE_MSG_KEYS // 4 - (0 if i == 0 else 2 * (n + 1))
+            write_msg(text_dir / lang / f"FOTEXT{n}.MSG", keys, seed=n * len(LANGUAGES) + min(i, 1))
+    return text_dir
+
+
+def make_proto_texts(count: int, seed: int = 0):
+    """(texts, types) like the proto names and descriptions classify_protos.py scores"""
+    rng = random.Random(seed)
+    texts = [" ".join(rng.choice(PROTO_WORDS) for _ in range(rng.randint(3, 12))) + f" {i}.fopro"
+             for i in range(count)]
+    types = [rng.randrange(7) for _ in range(count)]
+    return texts, types
+
+
+def make_random_grid(size: int = 400, density: float = 0.2, seed: int = 0):
+    """(width, height, blocked hexes) of a square grid with randomly blocked hexes"""
+    rng = random.Random(seed)
+    blocked = [(x, y) for y in range(size) for x in range(size) if rng.random() < density]
+    return size, size, blocked
+
+
+def make_serpentine(scale: int, height: int = 400):
+    """(width, height, blocked hexes) of a maze of full-width corridors joined at alternate ends
+
+    The number of turns is fixed by the height and only the corridors grow
+    with scale, which is what the flood fill's step count depends on.
+    """
+    width = scale * BASE_FLOOD_COLUMNS
+    blocked = []
+    for i, y in enumerate(range(2, height, 4)):
+        gap = width - 1 if i % 2 == 0 else 0
+        blocked.extend((x, y) for x in range(width) if x != gap)
+    return width, height, blocked
+
+
+def make_map(scale: int, seed: int = 0) -> FomapData:
+    """Map with scale * BASE_MAP_OBJECTS objects and scale * BASE_MAP_TILES tiles"""
+    rng = random.Random(seed)
+    data = FomapData()
+    data.header = {"Version": "4", "MaxHexX": "400", "MaxHexY": "400", "WorkHexX": "100", "WorkHexY": "100"}
+    for _ in range(scale * BASE_MAP_TILES):
+        data.tiles.append(Tile(rng.choice(("tile", "roof")), rng.randrange(0, 400, 2), rng.randrange(0, 400, 2),
+                               f"art\\tiles\\EDG{rng.randrange(5000, 5100)}.frm"))
+    for uid in range(1, scale * BASE_MAP_OBJECTS + 1):
+        obj_type = rng.choice((0, 1, 2, 2, 2))
+        fields = [("MapObjType", str(obj_type)), ("ProtoId", str(rng.randrange(1, 5000))),
+                  ("MapX", str(rng.randrange(400))), ("MapY", str(rng.randrange(400))), ("UID", str(uid))]
+        if obj_type == 0:
+            fields += [("Dir", str(rng.randrange(6))), ("Critter_Cond", "1")]
+        data.objects.append(tuple(fields))
+    return data
+
+
+def write_map(path: Path, scale: int, seed: int = 0) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_fomap(make_map(scale, seed), path)
+    return path
+
+
+def build_workspace(root: Path, scale: int) -> Workspace:
+    """Server/client trees, generated indexes and cfg sized by scale
+
+    The cfg's server root is the workspace root, so its ./server/... paths
+    are the files verify-index.py reads under server/; the cfg paths outside
+    server/ (items.lst, _defines.fos) are written at the root as well.
+    validate_indexation.py iterates lists of entities rather than the
+    indexer's wrapped JSON, so it gets its own database directory.
+    """
+    rng = random.Random(scale)
+    db_dir = root / "source" / "database"
+    indexation_db_dir = root / "indexation" / "database"
+    server = root / "server"
+    client = root / "client"
+
+    # Tiles on disk, with a few missing from and extra in tiles.json
+    tiles_dir = client / "data" / "art" / "tiles"
+    tiles_dir.mkdir(parents=True)
+    names = [f"TILE{i:06d}.frm" for i in range(scale * BASE_TILE_FILES)]
+    for name in names:
+        (tiles_dir / name).touch()
+    indexed = [f"art\\tiles\\{name}" for name in names if rng.random() > 0.01]
+    _write_json(db_dir / "tiles.json", {"all": indexed + ["art\\tiles\\STALE.frm"]})
+
+    # Critter and item protos: .lst files, .fopro files and their indexes
+    for kind, lst in (("critters", "critter.lst"), ("items", "items.lst")):
+        proto_dir = server / "proto" / kind
+        proto_dir.mkdir(parents=True)
+        entries = []
+        lines = []
+        for pid in range(scale * BASE_PROTOS):
+            name = f"{kind}_{pid}.fopro"
+            (proto_dir / name).write_text(f"[Proto]\nProtoId={pid}\n", encoding="utf-8")
+            lines.append(name)
+            if rng.random() > 0.01:
+                entries.append({"pid": pid, "file": name, "props": {"ProtoId": str(pid)} if pid % 50 else {}})
+        (server / "proto" / lst).write_text("\n".join(lines) + "\n", encoding="utf-8")
+        _write_json(db_dir / f"{kind}.json", {"entries": entries})
+        _write_json(indexation_db_dir / f"{kind}.json", [
+            {"proto_id": e["pid"], "script_name": f"{kind}_script_{e['pid'] % 97}" if e["pid"] % 3 else ""}
+            for e in entries])
+    (root / "items.lst").write_text((server / "proto" / "items.lst").read_text(encoding="utf-8"), encoding="utf-8")
+
+    # FOOBJ.MSG and objects.json
+    pids = scale * BASE_PROTOS * 2
+    write_msg(server / "text" / "engl" / "FOOBJ.MSG", pids * 2, seed=scale)
+    for name in ("FOGM.MSG", "FODLG.MSG", "FOGAME.MSG"):
+        write_msg(server / "text" / "engl" / name, 20, seed=scale)
+    objects = {pid: f"Object {pid}" if pid % 20 else "" for pid in range(pids) if rng.random() > 0.01}
+    _write_json(db_dir / "objects.json", {"entries": {str(pid): {"name": name} for pid, name in objects.items()}})
+    _write_json(indexation_db_dir / "objects.json", [
+        {"proto_id": pid, "name": name, "script_name": ""} for pid, name in objects.items()])
+
+    # _defines.fos and defines.json
+    defines = {f"PID_DEFINE_{i}": str(i) for i in range(scale * BASE_DEFINES)}
+    scripts_dir = server / "scripts"
+    scripts_dir.mkdir(parents=True)
+    with open(scripts_dir / "_defines.fos", "w", encoding="utf-8") as f:
+        for name, value in defines.items():
+            f.write(f"#define {name}  ({value})\n")
+    (root / "_defines.fos").write_text((scripts_dir / "_defines.fos").read_text(encoding="utf-8"), encoding="utf-8")
+    indexed_defines = {k: v for k, v in defines.items() if rng.random() > 0.01}
+    _write_json(db_dir / "defines.json", {"defines": indexed_defines})
+    _write_json(indexation_db_dir / "defines.json", [
+        {"define_name": k, "value": v} for k, v in indexed_defines.items()])
+    npc_pids = [{"define_name": f"NPC_{i}", "proto_id": i} for i in range(scale * BASE_PROTOS)]
+    maps = [{"map_id": i, "name": f"map_{i}"} for i in range(scale * BASE_PROTOS // 4)]
+    for directory in (db_dir, indexation_db_dir):
+        _write_json(directory / "npc_pids.json", npc_pids)
+        _write_json(directory / "maps.json", maps)
+
+    # Remaining sources the cfg lists, so the indexation checks find them all
+    for path in ("_npc_pids.fos", "ITEMPID.H", "worldmap_h.fos", "_maps.fos"):
+        (scripts_dir / path).write_text("// generated\n", encoding="utf-8")
+    maps_dir = server / "maps"
+    maps_dir.mkdir()
+    for path in ("GenerateWorld.cfg", "Locations.cfg", "_maps.fos", "PHX_maps.fos"):
+        (maps_dir / path).write_text("# generated\n", encoding="utf-8")
+
+    # Combined fonline-index.json for validate_index.py
+    count = scale * BASE_INDEX_ENTRIES
+    index = {
+        "creatures": {str(i): {"name": f"Critter {i}" if i % 30 else "", "file": f"c{i}.fopro"} for i in range(count)},
+        "items": {str(count + i): {"name": f"Item {i}" if i % 30 else "", "file": f"i{i}.fopro"} for i in range(count)},
+        "objects": {str(i): {"hasName": bool(i % 7), "hasDescription": bool(i % 11)} for i in range(count)},
+        "maps": {str(i): {"source": f"m{i}.fomap", "data": "" if i % 40 == 0 else f"m{i}"} for i in range(count // 10)},
+        "defines": {f"DEF_{i}": str(i % (count // 2)) for i in range(count)},
+        "references": {"missingNames": [f"PID {i}" for i in range(0, count, 50)]},
+    }
+    index_file = root / "fonline-index.json"
+    _write_json(index_file, index)
+
+    # Real cfg with the server root pointed at this workspace
+    config = root / "aop-nightmare.cfg"
+    lines = REAL_CONFIG.read_text(encoding="utf-8").splitlines()
+    lines = [f"server = {root}" if line.startswith("server =") else line for line in lines]
+    config.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    return Workspace(root, db_dir, indexation_db_dir, server, client, index_file, config,
+                     root / "validation_report.txt")
@@ -0,0 +1,94 @@
+"""Correctness and speedup checks for the .fosnap index snapshots"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from index_snapshot import (Snapshot, bench, is_stale, materialize, open_fresh,  # noqa: E402
+                            snapshot_path, write_snapshot)
+
+STRING_MAPPINGS = Path(__file__).resolve().parents[2] / "data" / "string-mappings.json"
+MIN_SPEEDUP = 10
+
+DOCUMENT = {
+    "null": None, "flags": [True, False], "int": -42, "big": 1 << 70, "float": 0.25,
+    "text": "Ashes of Phoenix", "unicode": "Напал на мирное селенье", "empty": {}, "none": [],
+    "nested": {"b": [1, {"z": "last", "a": "first"}], "a": {"deep": [None, "x"]}},
+}
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "index.json"
+    path.write_text(json.dumps(DOCUMENT), encoding="utf-8")
+    write_snapshot(path)
+    return path
+
+
+def test_roundtrip_keeps_values_and_key_order(source):
+    with Snapshot(snapshot_path(source)) as snap:
+        restored = materialize(snap.root)
+        assert snap.root["nested"]["b"][1]["z"] == "last"
+        assert "missing" not in snap.root
+    assert restored == DOCUMENT
+    assert list(restored["nested"]["b"][1]) == ["z", "a"]
+
+
+def test_fresh_snapshot_opens(source):
+    assert not is_stale(source)
+    snap = open_fresh(source)
+    assert snap is not None
+    with snap:
+        assert snap.root["int"] == -42
+
+
+def test_changed_size_is_stale(source):
+    source.write_text(json.dumps(dict(DOCUMENT, text="changed")), encoding="utf-8")
+    assert is_stale(source)
+    assert open_fresh(source) is None
+
+
+def test_touched_but_unchanged_file_stays_fresh(source):
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert not is_stale(source)
+
+
+def test_same_size_different_content_is_stale(source):
+    content = source.read_text(encoding="utf-8")
+    source.write_text(content.replace("Ashes", "Ashez"), encoding="utf-8")
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert is_stale(source)
+
+
+def test_missing_snapshot_is_stale(tmp_path):
+    path = tmp_path / "plain.json"
+    path.write_text("{}", encoding="utf-8")
+    assert is_stale(path)
+    assert open_fresh(path) is None
+
+
+def test_closed_snapshot_can_be_rewritten(source):
+    snap = Snapshot(snapshot_path(source))
+    assert len(snap.root) == len(DOCUMENT)
+    snap.close()
+    snap.close()
+    write_snapshot(source)
+    with Snapshot(snapshot_path(source)) as again:
+        assert again.root["float"] == 0.25
+
+
+def test_lookups_beat_json_load(tmp_path):
+    if not STRING_MAPPINGS.exists():
+        pytest.skip("data/string-mappings.json not present")
+    source = shutil.copy(STRING_MAPPINGS, tmp_path / STRING_MAPPINGS.name)
+    result = bench(source, lookups=100)
+    assert result["speedup"] >= MIN_SPEEDUP, (
+        f"snapshot open + {result['lookups']} lookups took {result['snapshot_ms']:.2f} ms vs "
+        f"json.load {result['json_load_ms']:.2f} ms ({result['speedup']:.1f}x, need {MIN_SPEEDUP}x)")
@@ -0,0 +1,82 @@
+"""Round-trip checks for map_diff: applying diff(old, new) to old must give new"""
+
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from fomap_parser import FomapData, Tile, read_fomap, write_fomap
+from map_diff import apply_patch, diff_maps
+from synthetic import write_map
+
+D3_MAP = Path(__file__).resolve().parents[1] / "fixtures" / "d3.fomap"
+
+
+def edited_d3() -> FomapData:
+    """d3.fomap with moved, changed, added and removed objects, tiles and header keys"""
+    data = read_fomap(D3_MAP)
+    data.header["WorkHexX"] = "120"
+    data.header["Comment"] = "edited"
+    del data.header["NoLogOut"]
+    del data.header["DayColor3"]
+
+    moved = dict(data.objects[0])
+    moved["MapX"] = str(int(moved["MapX"]) + 3)
+    data.objects[0] = tuple(moved.items())
+    changed = dict(data.objects[5])
+    changed["ScriptName"] = "door_lock"
+    data.objects[5] = tuple(changed.items())
+    trimmed = dict(data.objects[10])
+    trimmed.pop("MapObjType")
+    data.objects[10] = tuple(trimmed.items())
+    del data.objects[20:23]
+    data.objects.append((("MapObjType", "1"), ("ProtoId", "41"), ("MapX", "90"), ("MapY", "90")))
+    data.objects.append(data.objects[1])  # a duplicate of an existing object
+
+    data.tiles[0] = data.tiles[0]._replace(path="art\\tiles\\EDG5999.frm")
+    del data.tiles[1:4]
+    data.tiles.append(Tile("roof", 200, 200, "art\\tiles\\ROOF001.frm"))
+    return data
+
+
+def assert_same_map(actual: FomapData, expected: FomapData):
+    assert actual.header == expected.header
+    assert Counter(actual.tiles) == Counter(expected.tiles)
+    assert Counter(tuple(sorted(o)) for o in actual.objects) == Counter(tuple(sorted(o)) for o in expected.objects)
+
+
+def round_trip(old_path, new_path):
+    assert_same_map(apply_patch(read_fomap(old_path), diff_maps(old_path, new_path)), read_fomap(new_path))
+
+
+def test_round_trip_of_edited_fixture(tmp_path):
+    new_path = tmp_path / "d3_edited.fomap"
+    write_fomap(edited_d3(), new_path)
+    patch = diff_maps(D3_MAP, new_path)
+    assert sorted(patch["header_removed"]) == ["DayColor3", "NoLogOut"]
+    assert all(patch["objects"][kind] for kind in ("moved", "changed", "added", "removed"))
+    round_trip(D3_MAP, new_path)
+
+
+def test_round_trip_of_unrelated_maps(tmp_path):
+    round_trip(write_map(tmp_path / "old.fomap", 1, seed=1), write_map(tmp_path / "new.fomap", 1, seed=2))
+
+
+def test_identical_maps_give_an_empty_patch():
+    patch = diff_maps(D3_MAP, D3_MAP)
+    assert not patch["header"] and not patch["header_removed"]
+    assert not any(patch["tiles"].values()) and not any(patch["objects"].values())
+    round_trip(D3_MAP, D3_MAP)
+
+
+def test_patch_for_another_map_is_rejected(tmp_path):
+    new_path = tmp_path / "d3_edited.fomap"
+    write_fomap(edited_d3(), new_path)
+    patch = diff_maps(D3_MAP, new_path)
+    with pytest.raises(ValueError, match="object not found"):
+        apply_patch(read_fomap(new_path), patch)
+
+
+def test_unknown_patch_format_is_rejected():
+    with pytest.raises(ValueError, match="supported version"):
+        apply_patch(read_fomap(D3_MAP), {"format": "something-else", "version": 1})
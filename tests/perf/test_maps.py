@@ -0,0 +1,186 @@
+"""Baseline and complexity tests for the map tools (chunk cooking, proto usage, reachability)"""
+
+import argparse
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from conftest import scaled  # noqa: E402
+from cook_chunks import ChunkFile, chunk_size_arg, cook_corpus, cook_map  # noqa: E402
+from fomap_parser import read_fomap, write_fomap  # noqa: E402
+from map_reachability import HexGrid, ProtoFlags, analyze_map  # noqa: E402
+from proto_usage import build_index, connect, proto_usage, scan_map, unpack_positions  # noqa: E402
+from synthetic import make_random_grid, make_serpentine, write_map  # noqa: E402
+
+BASELINE_SCALE = 4
+D3_MAP = Path(__file__).resolve().parents[1] / "fixtures" / "d3.fomap"
+
+# make_map() draws ProtoIds from 1..4999
+FLAGS = ProtoFlags(blocking=frozenset(range(1, 1000)), interactive=frozenset(range(1000, 1500)),
+                   grids=frozenset(range(4900, 5000)))
+
+
+@pytest.fixture(scope="session")
+def cooked(maps, tmp_path_factory):
+    """.fochunks files of the synthetic maps by scale"""
+    root = tmp_path_factory.mktemp("chunks")
+
+    def cook(scale: int):
+        cook_map(maps(scale)[0], root / f"old{scale}x.fochunks")
+        return root / f"old{scale}x.fochunks"
+
+    return scaled(cook)
+
+
+def read_all_chunks(path):
+    with ChunkFile(path) as chunks:
+        for cy in range(chunks.chunks_y):
+            for cx in range(chunks.chunks_x):
+                chunks.read_chunk(cx, cy)
+
+
+def flood_args(width, height, blocked):
+    grid = HexGrid(width, height)
+    passable = grid.full & ~grid.raster(blocked)
+    seed = next(i for i in range(width * height) if passable >> i & 1)
+    return grid, 1 << seed, passable
+
+
+def placements(path):
+    """{pid: Counter of (MapX, MapY)} read straight from the map text"""
+    found = defaultdict(Counter)
+    for obj in read_fomap(path).objects:
+        fields = dict(obj)
+        found[int(fields["ProtoId"])][int(fields["MapX"]), int(fields["MapY"])] += 1
+    return found
+
+
+@pytest.mark.parametrize("chunk_size", [7, 32])
+def test_cooked_chunks_reproduce_the_map(tmp_path, chunk_size):
+    data = read_fomap(D3_MAP)
+    cook_map(D3_MAP, tmp_path / "d3.fochunks", chunk_size)
+    tiles, objects = Counter(), Counter()
+    with ChunkFile(tmp_path / "d3.fochunks") as chunks:
+        assert chunks.header == data.header
+        for cy in range(chunks.chunks_y):
+            for cx in range(chunks.chunks_x):
+                chunk = chunks.read_chunk(cx, cy)
+                for tile in chunk["tiles"] + chunk["roofs"]:
+                    assert (tile["hexX"] // chunk_size, tile["hexY"] // chunk_size) == (cx, cy)
+                    tiles[tile["layer"], tile["hexX"], tile["hexY"], tile["path"]] += 1
+                for obj in chunk["objects"]:
+                    assert (obj["MapX"] // chunk_size, obj["MapY"] // chunk_size) == (cx, cy)
+                    objects[tuple(sorted((k, str(v)) for k, v in obj.items()))] += 1
+    assert tiles == Counter(tuple(t) for t in data.tiles)
+    assert objects == Counter(tuple(sorted(o)) for o in data.objects)
+
+
+@pytest.mark.parametrize("position", [
+    (("MapY", "10"),),
+    (("MapX", "ten"), ("MapY", "10")),
+    (("MapX", "10"), ("MapY", "65536")),
+])
+def test_objects_without_a_position_are_errors(tmp_path, position):
+    data = read_fomap(D3_MAP)
+    data.objects.append((("MapObjType", "1"), ("ProtoId", "4242")) + position)
+    source = tmp_path / "broken.fomap"
+    write_fomap(data, source)
+    with pytest.raises(ValueError, match="without a valid MapX/MapY.*4242"):
+        cook_map(source, tmp_path / "broken.fochunks")
+    result = cook_corpus([source], tmp_path / "out", jobs=1)
+    assert result["cooked"] == 0 and "broken" in result["errors"]
+
+
+@pytest.mark.parametrize("size", ["0", "-1", "65536", "big"])
+def test_chunk_size_outside_u16_is_rejected(tmp_path, size):
+    with pytest.raises((argparse.ArgumentTypeError, ValueError)):
+        chunk_size_arg(size)
+    if size.lstrip("-").isdigit():
+        with pytest.raises(ValueError, match="Chunk size"):
+            cook_map(D3_MAP, tmp_path / "d3.fochunks", int(size))
+
+
+def test_scan_map_counts_every_placement():
+    objects, usage = scan_map(D3_MAP)
+    expected = placements(D3_MAP)
+    assert objects == len(read_fomap(D3_MAP).objects)
+    assert {pid: count for pid, (count, _) in usage.items()} == {pid: sum(c.values()) for pid, c in expected.items()}
+    assert {pid: Counter(unpack_positions(blob)) for pid, (_, blob) in usage.items()} == expected
+
+
+def test_proto_usage_index_stores_and_queries(tmp_path):
+    fixture = tmp_path / "d3.fomap"
+    fixture.write_bytes(D3_MAP.read_bytes())
+    other = write_map(tmp_path / "synthetic.fomap", 1, seed=1)
+    conn = connect(str(tmp_path / "usage.db"))
+    try:
+        result = build_index(conn, [fixture, other], jobs=1)
+        assert (result["scanned"], result["errors"]) == (2, {})
+        by_map = {"d3": placements(fixture), "synthetic": placements(other)}
+        shared = by_map["d3"].keys() & by_map["synthetic"].keys()
+        pid = max(shared, key=lambda p: sum(by_map["d3"][p].values()))
+        rows = proto_usage(conn, pid)
+        assert [name for name, _, _ in rows] == sorted(by_map, key=lambda name: (-sum(by_map[name][pid].values()), name))
+        for name, count, blob in rows:
+            assert count == sum(by_map[name][pid].values())
+            assert Counter(unpack_positions(blob)) == by_map[name][pid]
+
+        assert build_index(conn, [fixture, other], jobs=1)["skipped"] == 2
+        assert build_index(conn, [other], jobs=1)["removed"] == 1
+        assert [name for name, _, _ in proto_usage(conn, pid)] == ["synthetic"]
+    finally:
+        conn.close()
+
+
+def test_cook_map_baseline(perf, maps, tmp_path):
+    perf.check("cook_map_synthetic", cook_map, maps(BASELINE_SCALE)[0], tmp_path / "map.fochunks")
+
+
+def test_read_chunks_baseline(perf, cooked):
+    perf.check("read_chunks_synthetic", read_all_chunks, cooked(BASELINE_SCALE))
+
+
+def test_scan_map_baseline(perf, maps):
+    perf.check("scan_map_synthetic", scan_map, maps(BASELINE_SCALE)[0])
+
+
+def test_analyze_map_baseline(perf, maps):
+    perf.check("analyze_map_synthetic", analyze_map, maps(BASELINE_SCALE)[0], FLAGS)
+
+
+def test_flood_baseline(perf):
+    grid, seeds, passable = flood_args(*make_random_grid())
+    perf.check("hexgrid_flood_random", grid.flood, seeds, passable)
+
+
+def test_cook_map_scales_linearly(perf, maps, tmp_path):
+    paths = {scale: maps(scale)[0] for scale in perf.scales}
+    perf.assert_near_linear("cook_map", lambda scale: cook_map(paths[scale], tmp_path / f"{scale}x.fochunks"))
+
+
+def test_read_chunks_scales_linearly(perf, cooked):
+    paths = {scale: cooked(scale) for scale in perf.scales}
+    perf.assert_near_linear("read_chunk", lambda scale: read_all_chunks(paths[scale]))
+
+
+def test_scan_map_scales_linearly(perf, maps):
+    paths = {scale: maps(scale)[0] for scale in perf.scales}
+    perf.assert_near_linear("scan_map", lambda scale: scan_map(paths[scale]))
+
+
+def test_analyze_map_scales_linearly(perf, maps):
+    paths = {scale: maps(scale)[0] for scale in perf.scales}
+    perf.assert_near_linear("analyze_map", lambda scale: analyze_map(paths[scale], FLAGS))
+
+
+def test_flood_scales_linearly(perf):
+    grids = {scale: flood_args(*make_serpentine(scale)) for scale in perf.scales}
+
+    def flood(scale):
+        grid, seeds, passable = grids[scale]
+        grid.flood(seeds, passable)
+
+    perf.assert_near_linear("hexgrid_flood", flood)
@@ -0,0 +1,68 @@
+"""Correctness checks for msg_reader on the entry shapes found in the AoP MSG files"""
+
+import pytest
+
+from msg_reader import parse_msg, read_msg
+
+# Line shapes taken from FOGAME, FOTEXT, FOHOLO, FOOBJ and FOGM.MSG
+ENGLISH = """\
+# Speech colours
+{100}{}{|0xF8F993 %s}                     # Normal
+{102}{}{|0xFF0000 !!!%s!!!}               # Shout
+{510}{}{Yes} # Magic ball
+{11}{}{Lake (un)pleasant, march 17, 2123
+Dear diary, the water is %s again.}
+{925701}{}{It's always beer:30,
+somewhere.}
+{433600}{}{Family Combat Armor MkIII}f
+{14300000}{Bob's Range}
+{14300001}{}{Range entrance}
+{200}{}{}
+{300}{}{first}
+{300}{}{second}
+"""
+
+
+def test_parse_real_entry_shapes():
+    strings = parse_msg(ENGLISH)
+    assert strings == {
+        100: "|0xF8F993 %s",
+        102: "|0xFF0000 !!!%s!!!",
+        510: "Yes",
+        11: "Lake (un)pleasant, march 17, 2123\nDear diary, the water is %s again.",
+        925701: "It's always beer:30,\nsomewhere.",
+        433600: "Family Combat Armor MkIII",
+        14300000: "Bob's Range",
+        14300001: "Range entrance",
+        200: "",
+        300: "second",
+    }
+
+
+def test_commented_out_entries_are_skipped():
+    assert parse_msg("# {100}{}{old text}\n{101}{}{new text}\n") == {101: "new text"}
+
+
+def test_read_msg_matches_parse_msg(tmp_path):
+    path = tmp_path / "FOGAME.MSG"
+    path.write_text(ENGLISH, encoding="utf-8")
+    assert read_msg(path) == parse_msg(ENGLISH)
+
+
+def test_checker_sees_entries_with_comments_and_line_breaks(tmp_path):
+    pytest.importorskip("numpy")
+    from check_msg_languages import FormatPool, check_languages, discover_languages, load_tables
+
+    translated = (ENGLISH.replace("!!!%s!!!}", "!!!%d!!!}")
+                  .replace("{510}{}{Yes} # Magic ball\n", "")
+                  .replace("water is %s again", "water is %d again"))
+    for lang, content in (("engl", ENGLISH), ("russ", translated)):
+        (tmp_path / lang).mkdir()
+        (tmp_path / lang / "FOGAME.MSG").write_text(content, encoding="utf-8")
+
+    pool = FormatPool()
+    report = check_languages(load_tables(discover_languages(tmp_path), pool, jobs=1), pool)
+    result = report["languages"]["russ"]["files"]["FOGAME.MSG"]
+    assert result["missing"] == [510]
+    assert result["extra"] == []
+    assert sorted(entry["key"] for entry in result["placeholders"]) == [11, 102]
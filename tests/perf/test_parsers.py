@@ -0,0 +1,96 @@
+"""Baseline and complexity tests for the file format readers and writers"""
+
+from pathlib import Path
+
+import pytest
+
+from conftest import scaled
+from fomap_parser import read_fomap, serialize_fomap
+from map_diff import diff_maps
+from msg_reader import read_msg
+from synthetic import BASE_MSG_KEYS, write_msg
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures"
+D3_MAP = FIXTURES / "d3.fomap"
+
+BASELINE_SCALE = 4
+
+
+@pytest.fixture(scope="session")
+def msgs(tmp_path_factory):
+    """Synthetic FOOBJ.MSG files by scale, built on first use"""
+    root = tmp_path_factory.mktemp("msg")
+    return scaled(lambda scale: write_msg(root / f"FOOBJ{scale}x.MSG", scale * BASE_MSG_KEYS, seed=scale))
+
+
+def test_read_fixture_map(perf):
+    perf.check("read_fomap_d3", read_fomap, D3_MAP)
+
+
+def test_serialize_fixture_map(perf):
+    data = read_fomap(D3_MAP)
+    perf.check("serialize_fomap_d3", serialize_fomap, data)
+
+
+def test_read_map_baseline(perf, maps):
+    perf.check("read_fomap_synthetic", read_fomap, maps(BASELINE_SCALE)[0])
+
+
+def test_diff_maps_baseline(perf, maps):
+    perf.check("diff_maps_synthetic", diff_maps, *maps(BASELINE_SCALE))
+
+
+def test_read_msg_baseline(perf, msgs):
+    perf.check("read_msg_synthetic", read_msg, msgs(BASELINE_SCALE))
+
+
+def test_read_map_scales_linearly(perf, maps):
+    paths = {scale: maps(scale)[0] for scale in perf.scales}
+    perf.assert_near_linear("read_fomap", lambda scale: read_fomap(paths[scale]))
+
+
+def test_serialize_map_scales_linearly(perf, maps):
+    data = {scale: read_fomap(maps(scale)[0]) for scale in perf.scales}
+    perf.assert_near_linear("serialize_fomap", lambda scale: serialize_fomap(data[scale]))
+
+
+def test_diff_maps_scales_linearly(perf, maps):
+    pairs = {scale: maps(scale) for scale in perf.scales}
+    perf.assert_near_linear("diff_maps", lambda scale: diff_maps(*pairs[scale]))
+
+
+def test_read_msg_scales_linearly(perf, msgs):
+    paths = {scale: msgs(scale) for scale in perf.scales}
+    perf.assert_near_linear("read_msg", lambda scale: read_msg(paths[scale]))
+
+
+def test_index_snapshot_write_baseline(perf, workspaces, tmp_path):
+    pytest.importorskip("numpy")
+    from index_snapshot import write_snapshot
+
+    perf.check("index_snapshot_write", write_snapshot, workspaces(BASELINE_SCALE).index_file,
+               tmp_path / "index.fosnap")
+
+
+def test_index_snapshot_lookups_baseline(perf, workspaces, tmp_path):
+    pytest.importorskip("numpy")
+    from index_snapshot import Snapshot, write_snapshot
+
+    target = write_snapshot(workspaces(BASELINE_SCALE).index_file, tmp_path / "index.fosnap")
+    keys = [str(i) for i in range(0, 2000, 20)]
+
+    def open_and_look_up():
+        with Snapshot(target) as snap:
+            creatures = snap.root["creatures"]
+            return [creatures[k]["name"] for k in keys]
+
+    perf.check("index_snapshot_lookups", open_and_look_up)
+
+
+def test_index_snapshot_scales_linearly(perf, workspaces, tmp_path):
+    pytest.importorskip("numpy")
+    from index_snapshot import write_snapshot
+
+    sources = {scale: workspaces(scale).index_file for scale in perf.scales}
+    perf.assert_near_linear("index_snapshot",
+                            lambda scale: write_snapshot(sources[scale], tmp_path / f"index{scale}x.fosnap"))
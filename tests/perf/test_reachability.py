@@ -0,0 +1,80 @@
+"""Correctness checks for the map_reachability bitset flood fill"""
+
+import random
+from collections import deque
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from fomap_parser import FomapData, write_fomap  # noqa: E402
+from map_reachability import HexGrid, ProtoFlags, analyze_map  # noqa: E402
+
+
+def hex_neighbours(hx, hy):
+    """hexNeighbors() from src/engine/hexMath.js"""
+    if hy & 1:
+        return [(hx + 1, hy), (hx + 1, hy - 1), (hx, hy - 1), (hx - 1, hy), (hx, hy + 1), (hx + 1, hy + 1)]
+    return [(hx + 1, hy), (hx, hy - 1), (hx - 1, hy - 1), (hx - 1, hy), (hx - 1, hy + 1), (hx, hy + 1)]
+
+
+def bfs(width, height, seeds, blocked):
+    reached = set(seeds)
+    queue = deque(seeds)
+    while queue:
+        for hx, hy in hex_neighbours(*queue.popleft()):
+            if 0 <= hx < width and 0 <= hy < height and (hx, hy) not in blocked and (hx, hy) not in reached:
+                reached.add((hx, hy))
+                queue.append((hx, hy))
+    return reached
+
+
+def to_hexes(grid, bits):
+    return {(i % grid.width, i // grid.width) for i in range(grid.width * grid.height) if bits >> i & 1}
+
+
+def test_flood_matches_bfs_on_random_grids():
+    rng = random.Random(33)
+    for _ in range(300):
+        width, height = rng.randint(1, 70), rng.randint(1, 70)
+        density = rng.choice((0.1, 0.3, 0.45, 0.6))
+        blocked = {(x, y) for y in range(height) for x in range(width) if rng.random() < density}
+        open_hexes = [(x, y) for y in range(height) for x in range(width) if (x, y) not in blocked]
+        if not open_hexes:
+            continue
+        seeds = rng.sample(open_hexes, min(len(open_hexes), rng.randint(1, 3)))
+
+        grid = HexGrid(width, height)
+        reached = grid.flood(grid.raster(seeds), grid.full & ~grid.raster(sorted(blocked)))
+        assert to_hexes(grid, reached) == bfs(width, height, seeds, blocked), (width, height, seeds)
+
+
+def test_neighbours_match_hex_math():
+    grid = HexGrid(9, 8)
+    for hy in range(grid.height):
+        for hx in range(grid.width):
+            expected = {h for h in hex_neighbours(hx, hy) if grid.contains(*h)}
+            assert to_hexes(grid, grid.neighbours(grid.bit(hx, hy))) == expected, (hx, hy)
+
+
+def test_entire_objects_seed_the_flood(tmp_path):
+    # A ring of walls around (20,20); the entire sits inside it, WorkHex outside
+    ring = hex_neighbours(20, 20)
+    data = FomapData()
+    data.header = {"MaxHexX": "40", "MaxHexY": "40", "WorkHexX": "5", "WorkHexY": "5"}
+    data.objects = [(("MapObjType", "2"), ("ProtoId", "1"), ("MapX", str(x)), ("MapY", str(y))) for x, y in ring]
+    data.objects.append((("MapObjType", "2"), ("ProtoId", "3853"), ("MapX", "20"), ("MapY", "20")))
+    data.objects.append((("MapObjType", "1"), ("ProtoId", "7"), ("MapX", "30"), ("MapY", "30")))
+    path = tmp_path / "ring.fomap"
+    write_fomap(data, path)
+    flags = ProtoFlags(blocking=frozenset({1}), interactive=frozenset({7}), grids=frozenset())
+
+    report = analyze_map(path, flags)
+    assert report["seeded_from"] == "entire"
+    assert report["reachable"] == 1
+    assert [entry["pid"] for entry in report["unreachable"]] == [7]
+
+    without = flags._replace(entires=frozenset())
+    assert analyze_map(path, without)["seeded_from"] == "workhex"
+    assert analyze_map(path, without)["unreachable"] == []
+    assert analyze_map(path, without, entrances=[(20, 20)])["seeded_from"] == "entrance"
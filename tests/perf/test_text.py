@@ -0,0 +1,116 @@
+"""Baseline and complexity tests for the MSG language checker and the proto classifier"""
+
+import shutil
+import sqlite3
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from check_msg_languages import FormatPool, MsgTable, compare_tables, discover_languages, load_tables  # noqa: E402
+from classify_protos import SemanticClassifier, run  # noqa: E402
+from conftest import scaled  # noqa: E402
+from synthetic import (BASE_PROTO_TEXTS, BASE_TABLE_KEYS, REAL_CONFIG, ROOT, build_text_dir,  # noqa: E402
+                       make_proto_texts)
+
+BASELINE_SCALE = 4
+
+
+@pytest.fixture(scope="session")
+def languages(tmp_path_factory):
+    """discover_languages() of synthetic text/ trees by scale"""
+    return scaled(lambda scale: discover_languages(build_text_dir(tmp_path_factory.mktemp(f"text{scale}x"), scale)))
+
+
+def make_table(rng, keys: int) -> MsgTable:
+    """Sorted MSG keys, about one in ten with a placeholder signature id"""
+    picked = np.sort(rng.choice(keys * 2, size=keys, replace=False)) * 100
+    formats = np.where(rng.random(keys) < 0.1, rng.integers(1, 8, size=keys), 0).astype(np.int32)
+    return MsgTable(picked, formats)
+
+
+def make_table_pair(scale: int):
+    rng = np.random.default_rng(scale)
+    keys = scale * BASE_TABLE_KEYS
+    return make_table(rng, keys), make_table(rng, keys)
+
+
+@pytest.fixture(scope="session")
+def tables():
+    """(reference, other) MsgTables of scale * BASE_TABLE_KEYS keys, built on first use"""
+    return scaled(make_table_pair)
+
+
+@pytest.fixture(scope="session")
+def classifier():
+    return SemanticClassifier(str(REAL_CONFIG))
+
+
+def proto_texts(scale: int):
+    texts, types = make_proto_texts(scale * BASE_PROTO_TEXTS, seed=scale)
+    return texts, np.array(types, dtype=np.int64)
+
+
+def test_compare_tables_reports_differences():
+    reference = MsgTable(np.array([100, 101, 200, 300, 301]), np.array([0, 1, 0, 2, 1], dtype=np.int32))
+    other = MsgTable(np.array([100, 101, 300, 301, 400]), np.array([0, 2, 0, 1, 0], dtype=np.int32))
+    result = compare_tables(reference, other)
+    assert {name: values.tolist() for name, values in result.items()} == {
+        "missing": [200], "extra": [400], "placeholders": [101, 300], "expected": [1, 2], "found": [2, 0],
+    }
+
+
+def test_classify_picks_categories_within_the_type_group(classifier):
+    texts = ["Raider thug with a pistol", "Small gecko", "Leather jacket", "Wooden door",
+             "Raider armor", "gecko.fopro"]
+    types = np.array([0, 0, 1, 2, 1, 1])
+    best, _ = classifier.classify(texts, types)
+    picked = [classifier.categories[i] if i >= 0 else None for i in best]
+    assert picked == ["bandits", "geckos", "armor", "doors", "armor", None]
+
+
+def test_classify_run_only_updates_protos(tmp_path):
+    db = shutil.copy(ROOT / "data" / "protos.db", tmp_path / "protos.db")
+    with sqlite3.connect(db) as conn:
+        conn.executemany("INSERT INTO protos (proto_id, type, name, source_file) VALUES (?, ?, ?, ?)",
+                         [(2000, 0, "Raider thug", "raider.fopro"), (2001, 1, "Leather jacket", "jacket.fopro")])
+        categories = conn.execute("SELECT * FROM categories ORDER BY category_id").fetchall()
+    conn.close()
+
+    stats = run(str(db), str(REAL_CONFIG), None, dry_run=False)
+    conn = sqlite3.connect(db)
+    try:
+        assert conn.execute("SELECT * FROM categories ORDER BY category_id").fetchall() == categories
+        assert dict(conn.execute("SELECT proto_id, category FROM protos WHERE proto_id >= 2000")) == {
+            2000: "bandits", 2001: "armor"}
+    finally:
+        conn.close()
+    assert stats["changed"] >= 2
+
+
+def test_load_tables_baseline(perf, languages):
+    perf.check("load_msg_tables_synthetic", lambda: load_tables(languages(BASELINE_SCALE), FormatPool(), jobs=1))
+
+
+def test_compare_tables_baseline(perf, tables):
+    perf.check("compare_msg_tables_synthetic", compare_tables, *tables(BASELINE_SCALE))
+
+
+def test_classify_baseline(perf, classifier):
+    perf.check("classify_protos_synthetic", classifier.classify, *proto_texts(BASELINE_SCALE))
+
+
+def test_load_tables_scales_linearly(perf, languages):
+    trees = {scale: languages(scale) for scale in perf.scales}
+    perf.assert_near_linear("load_msg_tables", lambda scale: load_tables(trees[scale], FormatPool(), jobs=1))
+
+
+def test_compare_tables_scales_linearly(perf, tables):
+    pairs = {scale: tables(scale) for scale in perf.scales}
+    perf.assert_near_linear("compare_msg_tables", lambda scale: compare_tables(*pairs[scale]))
+
+
+def test_classify_scales_linearly(perf, classifier):
+    inputs = {scale: proto_texts(scale) for scale in perf.scales}
+    perf.assert_near_linear("classify_protos", lambda scale: classifier.classify(*inputs[scale]))
@@ -0,0 +1,55 @@
+"""Baseline and complexity tests for the index validators"""
+
+import importlib
+
+import pytest
+
+from index_cache import IndexCache
+from validate_index import IndexValidator
+from validate_indexation import IndexationValidator
+
+verify_index = importlib.import_module("verify-index")
+
+BASELINE_SCALE = 4
+
+
+def run_index_validator(ws):
+    IndexValidator(str(ws.index_file), cache=IndexCache(ws.db_dir)).run_validation(str(ws.report))
+
+
+def run_indexation_validator(ws):
+    IndexationValidator(str(ws.config), cache=IndexCache(ws.indexation_db_dir)).run_all()
+
+
+def verify_check(name, uses_client=False):
+    def run(ws):
+        check = getattr(verify_index, name)
+        check(ws.client if uses_client else ws.server, IndexCache(ws.db_dir))
+    return run
+
+
+RUNNERS = {
+    "index_validator": run_index_validator,
+    "indexation_validator": run_indexation_validator,
+    "verify_check_tiles": verify_check("check_tiles", uses_client=True),
+    "verify_check_critters": verify_check("check_critters"),
+    "verify_check_items": verify_check("check_items"),
+    "verify_check_objects": verify_check("check_objects"),
+    "verify_check_defines": verify_check("check_defines"),
+}
+
+
+def test_every_verify_check_is_covered():
+    checks = {name for name in dir(verify_index) if name.startswith("check_")}
+    assert checks == {name[len("verify_"):] for name in RUNNERS if name.startswith("verify_")}
+
+
+@pytest.mark.parametrize("name", sorted(RUNNERS))
+def test_baseline(perf, workspaces, name):
+    perf.check(name, RUNNERS[name], workspaces(BASELINE_SCALE))
+
+
+@pytest.mark.parametrize("name", sorted(RUNNERS))
+def test_scales_linearly(perf, workspaces, name):
+    scaled = {scale: workspaces(scale) for scale in perf.scales}
+    perf.assert_near_linear(name, lambda scale: RUNNERS[name](scaled[scale]))